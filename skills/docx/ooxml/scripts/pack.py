@@ -3,15 +3,18 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--reference <office_file>]
 """
 
 import argparse
+import os
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
+import defusedxml.sax
+import xml.sax.handler
 import zipfile
 from pathlib import Path
 
@@ -21,11 +24,18 @@ def main():
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--reference",
+        help="Office file the directory was unpacked from; unchanged members are copied from it",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            reference=args.reference,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +52,30 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+# Condensed parts up to this size are kept in memory while packing
+SPOOL_SIZE = 16 << 20
+
+# Formats that are already compressed and gain nothing from deflate
+STORED_EXTENSIONS = frozenset(
+    {".png", ".jpg", ".jpeg", ".gif", ".wdp", ".mp4", ".mov", ".m4a", ".mp3"}
+)
+
+
+def pack_document(input_dir, output_file, validate=False, reference=None):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    XML parts are condensed in memory and deflated, and already-compressed
+    media (see STORED_EXTENSIONS) is stored as it is. With a reference package,
+    members whose content is unchanged are copied from it without
+    recompressing them (see copy_raw_member), so packing an edited document
+    only compresses the parts that changed.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        reference: Optional Office file the directory was unpacked from. It
+            may be output_file itself.
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,32 +88,122 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    files = {
+        f.relative_to(input_dir).as_posix(): f
+        for f in input_dir.rglob("*")
+        if f.is_file()
+    }
+
+    # Write next to the output and move it into place, so the reference can
+    # be the output file itself
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=output_file.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(temp_name, "w", zipfile.ZIP_DEFLATED) as zf:
+            if reference is None:
+                for name, f in files.items():
+                    _pack_member(zf, f, name)
+            else:
+                with zipfile.ZipFile(reference) as source:
+                    known = {info.filename: info for info in source.infolist()}
+                    # Keep the reference's member order ([Content_Types].xml first)
+                    names = [name for name in known if name in files]
+                    names += [name for name in files if name not in known]
+                    for name in names:
+                        _pack_member(zf, files[name], name, source, known.get(name))
+        move_into_place(temp_name, output_file)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def move_into_place(temp_name, target):
+    """Replace target with a finished temporary file.
+
+    The file gets target's mode, or the default mode for new files if target
+    does not exist yet (mkstemp creates files readable only by their owner).
+    """
+    if target.exists():
+        shutil.copymode(target, temp_name)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_name, 0o666 & ~umask)
+    os.replace(temp_name, target)
+
+
+def _pack_member(zf, path, name, source=None, info=None):
+    """Add a file to the package, copying info from source if it is unchanged.
+
+    Args:
+        zf: zipfile.ZipFile being written
+        path: File to add
+        name: Member name
+        source: Optional reference zipfile.ZipFile
+        info: zipfile.ZipInfo of the member with the same name in source
+    """
+    if path.name.endswith((".xml", ".rels")):
+        # Parts that were never pretty-printed match without condensing
+        if info is not None and _same_file(path, source, info):
+            copy_raw_member(source, info, zf)
+            return
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as condensed:
+            with open(path, "rb") as f:
+                condense_stream(f, condensed)
+            size = condensed.tell()
+            condensed.seek(0)
+            if (
+                info is not None
+                and info.file_size == size
+                and _same_stream(condensed, source, info)
+            ):
+                copy_raw_member(source, info, zf)
+                return
+            condensed.seek(0)
+            zinfo = zipfile.ZipInfo.from_file(path, name)
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zinfo.file_size = size
+            with zf.open(zinfo, "w") as member:
+                shutil.copyfileobj(condensed, member, 1 << 20)
+        return
+
+    if info is not None and _same_file(path, source, info):
+        copy_raw_member(source, info, zf)
+        return
+    if path.suffix.lower() in STORED_EXTENSIONS:
+        zf.write(path, name, zipfile.ZIP_STORED)
+    else:
+        zf.write(path, name)
+
+
+def _same_file(path, source, info):
+    """Check whether a member of source holds exactly the content of a file."""
+    if info.file_size != path.stat().st_size:
+        return False
+    with open(path, "rb") as f:
+        return _same_stream(f, source, info)
+
+
+def _same_stream(f, source, info):
+    """Check whether a member of source holds exactly the rest of a binary file."""
+    with source.open(info) as member:
+        while True:
+            chunk = f.read(1 << 20)
+            if chunk != member.read(len(chunk)):
+                return False
+            if not chunk:
+                return True
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
@@ -130,29 +247,198 @@ def validate_document(doc_path):
             return False
 
 
+def copy_raw_member(source, info, target):
+    """Copy a member from one open zip file to another without recompressing it.
+
+    The compressed bytes are copied as they are, so the member stays
+    byte-identical (same compression, CRC and timestamp) and copying costs
+    only I/O.
+
+    Args:
+        source: zipfile.ZipFile opened for reading
+        info: zipfile.ZipInfo of the member in source
+        target: zipfile.ZipFile opened for writing
+    """
+    if info.flag_bits & 0x1:
+        raise ValueError(f"Cannot copy encrypted member: {info.filename}")
+
+    # Skip the member's local header; its name and extra field lengths are the
+    # last two fields of the fixed-size part
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(
+        zipfile.structFileHeader, source.fp.read(zipfile.sizeFileHeader)
+    )
+    source.fp.seek(header[10] + header[11], 1)
+
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    copy.compress_type = info.compress_type
+    copy.CRC = info.CRC
+    copy.compress_size = info.compress_size
+    copy.file_size = info.file_size
+    copy.create_system = info.create_system
+    copy.internal_attr = info.internal_attr
+    copy.external_attr = info.external_attr
+    # Sizes and CRC go in the local header, so no data descriptor follows
+    copy.flag_bits = info.flag_bits & ~0x08
+    copy.header_offset = target.fp.tell()
+
+    target.fp.write(copy.FileHeader())
+    remaining = info.compress_size
+    while remaining:
+        chunk = source.fp.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member: {info.filename}")
+        target.fp.write(chunk)
+        remaining -= len(chunk)
+
+    target.filelist.append(copy)
+    target.NameToInfo[copy.filename] = copy
+    target.start_dir = target.fp.tell()
+    target._didModify = True
+
+
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    xml_file = Path(xml_file)
+    fd, temp_name = tempfile.mkstemp(dir=xml_file.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as target, open(xml_file, "rb") as source:
+            condense_stream(source, target)
+        move_into_place(temp_name, xml_file)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
 
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
 
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+def condense_stream(source, target):
+    """Condense XML read from a binary file into another, in bounded memory.
+
+    The part is parsed with SAX and written out as it is read, so memory use
+    depends on the nesting depth and the longest text, not on the part size.
+    The output is the same as serializing the part with minidom after
+    removing, from every element whose name does not end in ":t",
+    whitespace-only text and comments.
+
+    Args:
+        source: Binary file to read the XML from
+        target: Binary file to write the condensed XML to
+    """
+    condenser = _Condenser(target.write)
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(condenser)
+    parser.setProperty(xml.sax.handler.property_lexical_handler, condenser)
+    parser.parse(source)
+
+
+class _Condenser(xml.sax.handler.ContentHandler, xml.sax.handler.LexicalHandler):
+    """SAX handler that writes the condensed form of a part (see condense_stream)."""
+
+    def __init__(self, write):
+        super().__init__()
+        self._write = write
+        self._pieces = []
+        self._size = 0
+        self._tags = []  # Names of the open elements
+        self._open = False  # The last start tag still needs its ">"
+        self._text = []  # Character data of the current text node
+        self._cdata = None  # Character data of the current CDATA section
+
+    def _emit(self, piece):
+        if self._open:
+            self._pieces.append(">")
+            self._open = False
+        self._pieces.append(piece)
+        self._size += len(piece)
+        if self._size > 1 << 16:
+            self._flush()
+
+    def _flush(self):
+        self._write("".join(self._pieces).encode("utf-8"))
+        self._pieces = []
+        self._size = 0
+
+    def _end_text(self):
+        """Write the text node that just ended, unless it is whitespace to drop."""
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        # Text outside the root element is not kept, as with minidom
+        if not self._tags:
+            return
+        if text.strip() == "" and not self._tags[-1].endswith(":t"):
+            return
+        self._emit(_escape(text))
+
+    def startDocument(self):
+        self._emit('<?xml version="1.0" encoding="UTF-8"?>')
+
+    def endDocument(self):
+        self._flush()
+
+    def startElement(self, name, attrs):
+        self._end_text()
+        # minidom puts namespace declarations before the other attributes
+        names = attrs.getNames()
+        names = [n for n in names if n == "xmlns" or n.startswith("xmlns:")] + [
+            n for n in names if n != "xmlns" and not n.startswith("xmlns:")
+        ]
+        self._emit(
+            "<"
+            + name
+            + "".join(f' {n}="{_escape(attrs.getValue(n))}"' for n in names)
+        )
+        self._open = True
+        self._tags.append(name)
+
+    def endElement(self, name):
+        self._end_text()
+        if self._open:
+            self._pieces.append("/>")
+            self._open = False
+        else:
+            self._emit(f"</{name}>")
+        self._tags.pop()
+
+    def characters(self, content):
+        if self._cdata is not None:
+            self._cdata.append(content)
+        else:
+            self._text.append(content)
+
+    def processingInstruction(self, target, data):
+        self._end_text()
+        self._emit(f"<?{target} {data}?>")
+
+    def comment(self, content):
+        self._end_text()
+        if not self._tags or self._tags[-1].endswith(":t"):
+            self._emit(f"<!--{content}-->")
+
+    def startCDATA(self):
+        self._end_text()
+        self._cdata = []
+
+    def endCDATA(self):
+        data = "".join(self._cdata)
+        self._cdata = None
+        if data:
+            self._emit(f"<![CDATA[{data}]]>")
+
+    def startDTD(self, name, public_id, system_id):
+        # defusedxml refuses external DTDs, so only the name is left to write
+        self._end_text()
+        self._emit(f"<!DOCTYPE {name}>")
+
+
+def _escape(data):
+    """Escape text or an attribute value the way minidom writes it."""
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
 
 
 if __name__ == "__main__":
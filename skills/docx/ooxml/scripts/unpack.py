@@ -1,29 +1,132 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""
+Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--jobs N] [--lazy [PART ...]]
+"""
+
+import argparse
+import os
 import random
-import sys
+import shutil
+import tempfile
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
+# Parts --lazy pretty-prints when no parts are given
+MAIN_PARTS = {
+    ".docx": ["word/document.xml"],
+    ".pptx": ["ppt/presentation.xml"],
+    ".xlsx": ["xl/workbook.xml"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack and format XML contents of Office files"
+    )
+    parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Processes that pretty-print parts (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--lazy",
+        nargs="*",
+        metavar="PART",
+        help="Only pretty-print these parts (glob patterns such as "
+        "ppt/slides/slide1.xml; default: the main part) and leave the rest as stored",
+    )
+    args = parser.parse_args()
+
+    unpack_document(args.input_file, args.output_dir, jobs=args.jobs, lazy=args.lazy)
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, jobs=None, lazy=None):
+    """Extract an Office file and pretty-print its XML parts.
+
+    Args:
+        input_file: Path to the Office file
+        output_dir: Directory to unpack into
+        jobs: Number of processes that pretty-print parts (default: one per CPU)
+        lazy: If not None, only the parts matching these glob patterns are
+            pretty-printed (the main part if empty) and the others are left
+            as stored. Document pretty-prints those when it first opens them.
+
+    Returns:
+        list: The pretty-printed files
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    zipfile.ZipFile(input_file).extractall(output_path)
 
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
+    if lazy is None:
+        xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
+    else:
+        patterns = lazy or MAIN_PARTS.get(Path(input_file).suffix.lower(), [])
+        xml_files = sorted(
+            {
+                xml_file
+                for pattern in patterns
+                for xml_file in output_path.glob(pattern)
+                if xml_file.is_file()
+            }
+        )
 
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
+    pretty_print_files(xml_files, jobs=jobs)
+    return xml_files
+
+
+def pretty_print_files(xml_files, jobs=None):
+    """Pretty-print XML files, in parallel processes when there are several.
+
+    Args:
+        xml_files: Paths of the files
+        jobs: Number of processes (default: one per CPU); 1 formats in this process
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(xml_files) < 2:
+        for xml_file in xml_files:
+            pretty_print_xml(xml_file)
+        return
+
+    # Largest parts first, so one big part does not finish last on its own
+    xml_files = sorted(xml_files, key=lambda f: f.stat().st_size, reverse=True)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(xml_files))) as executor:
+        # list() re-raises the first error of any worker
+        list(executor.map(pretty_print_xml, xml_files))
+
+
+def pretty_print_xml(xml_file):
+    """Rewrite an XML file indented, as ASCII with character references.
+
+    The file is replaced rather than written in place, so hard links to it
+    (such as the ones a Document session makes) keep the old content.
+    """
+    xml_file = Path(xml_file)
     content = xml_file.read_text(encoding="utf-8")
     dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+    fd, temp_name = tempfile.mkstemp(dir=xml_file.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dom.toprettyxml(indent="  ", encoding="ascii"))
+        shutil.copymode(xml_file, temp_name)
+        os.replace(temp_name, xml_file)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
 
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,32 @@ Command line tool to validate Office document XML files against XSD schemas and
 
 Usage:
     python validate.py <dir> --original <original_file>
+
+Long-lived workers that import this module can call warm_up() once at startup
+so the XSD schemas are compiled before the first document is validated.
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
+from validation.base import DEFAULT_STREAMING_THRESHOLD
+from validation.cache import OriginalPackage, ParsedTreeCache
+
+
+def warm_up():
+    """Compile all XSD schemas into the process-wide schema cache.
+
+    Returns:
+        int: Number of schemas compiled
+    """
+    return BaseSchemaValidator.warm_schema_cache()
 
 
 def main():
@@ -30,6 +49,26 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for XSD validation (default: 1)",
+    )
+    parser.add_argument(
+        "--manifest-dir",
+        help="Directory for incremental validation manifests. Parts unchanged "
+        "since the last passing run are not rechecked.",
+    )
+    parser.add_argument(
+        "--streaming-threshold",
+        type=float,
+        default=DEFAULT_STREAMING_THRESHOLD / (1024 * 1024),
+        metavar="MB",
+        help="Parts larger than this are checked for well-formedness and IDs "
+        "with a streaming parser (default: %(default)g)",
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -52,12 +91,27 @@ def main():
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
 
-    # Run validators
+    # Run validators, sharing one view of the original file and the parsed
+    # trees of the unpacked parts between them
     success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    tree_cache = ParsedTreeCache()
+    with OriginalPackage(original_file) as original_package:
+        for V in validators:
+            options = {
+                "verbose": args.verbose,
+                "original_package": original_package,
+                "tree_cache": tree_cache,
+            }
+            if issubclass(V, BaseSchemaValidator):
+                options["jobs"] = args.jobs
+                options["streaming_threshold"] = int(
+                    args.streaming_threshold * 1024 * 1024
+                )
+            if args.manifest_dir:
+                options["manifest_path"] = Path(args.manifest_dir) / f"{V.__name__}.json"
+            validator = V(unpacked_dir, original_file, **options)
+            if not validator.validate():
+                success = False
 
     if success:
         print("All validations PASSED!")
@@ -2,11 +2,260 @@
 Base validator with common validation logic for document files.
 """
 
+import hashlib
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+from .cache import BaselineErrorMemo, OriginalPackage, ParsedTreeCache
+from .manifest import ValidationManifest
+from .traversal import (
+    TreeCheck,
+    check_well_formed,
+    is_streamed,
+    run_tree_checks,
+)
+
+# Directory containing the bundled OOXML schemas
+SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
+
+# Parts larger than this are checked for well-formedness and IDs with a
+# streaming parser instead of being loaded as a whole tree
+DEFAULT_STREAMING_THRESHOLD = 64 * 1024 * 1024
+
+# Compiled XSD schemas keyed by schema path, shared by every validator instance
+# in this process. The wml/pml/sml schemas and their imports take hundreds of
+# milliseconds to compile, so each one is compiled at most once per process.
+# Schemas that fail to compile are cached as their exception and re-raised.
+_SCHEMA_CACHE = {}
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it on first use.
+
+    Raises:
+        lxml.etree.XMLSchemaParseError: If the schema cannot be compiled
+    """
+    key = str(schema_path)
+    if key not in _SCHEMA_CACHE:
+        try:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+                _SCHEMA_CACHE[key] = lxml.etree.XMLSchema(xsd_doc)
+        except lxml.etree.XMLSchemaParseError as e:
+            _SCHEMA_CACHE[key] = e
+
+    schema = _SCHEMA_CACHE[key]
+    if isinstance(schema, Exception):
+        raise schema.with_traceback(None)
+    return schema
+
+
+# Validator instance owned by each worker process of a parallel XSD run
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, memo_settings):
+    """Process pool initializer: build this worker's validator.
+
+    Each worker keeps its own compiled schema cache, parsed trees and view of
+    the original package for the lifetime of the pool.
+    """
+    global _worker_validator
+    cache_dir, max_bytes = memo_settings
+    _worker_validator = validator_class(
+        unpacked_dir,
+        original_file,
+        baseline_memo=BaselineErrorMemo(cache_dir, max_bytes),
+    )
+
+
+def _validate_file_in_worker(xml_file):
+    """Validate one file in a worker. Returns (is_valid, errors, memo_hits, memo_misses)."""
+    memo = _worker_validator.baseline_memo
+    hits, misses = memo.hits, memo.misses
+    is_valid, new_errors = _worker_validator.validate_file_against_xsd(xml_file)
+    return is_valid, new_errors, memo.hits - hits, memo.misses - misses
+
+
+class UniqueIdCheck(TreeCheck):
+    """IDs that must be unique within their file or across all files.
+
+    Elements inside mc:AlternateContent are ignored, since the alternatives
+    repeat the same content with the same IDs.
+    """
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.local_names = frozenset(validator.UNIQUE_ID_REQUIREMENTS)
+        self.alternate_content_tag = f"{{{validator.MC_NAMESPACE}}}AlternateContent"
+        self.tags = self.end_tags = frozenset([self.alternate_content_tag])
+        self.global_ids = {}  # Track globally unique IDs across all files
+
+    def check_global_id(self, xml_file, id_value, line, tag):
+        if id_value in self.global_ids:
+            prev_file, prev_line, prev_tag = self.global_ids[id_value]
+            self.errors.append(
+                f"  {xml_file.relative_to(self.validator.unpacked_dir)}: "
+                f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+            )
+        else:
+            self.global_ids[id_value] = (
+                xml_file.relative_to(self.validator.unpacked_dir),
+                line,
+                tag,
+            )
+
+    def begin_file(self, xml_file):
+        if self.validator._is_unchanged(xml_file):
+            # File-level IDs passed last run; replay its global IDs only
+            for id_value, line, tag in self.validator._previous_summary(
+                xml_file, "global_ids", []
+            ):
+                self.check_global_id(xml_file, id_value, line, tag)
+            return False
+
+        self.xml_file = xml_file
+        self.file_ids = {}  # Track IDs that must be unique within this file
+        self.file_global_ids = []  # Global IDs, kept for incremental runs
+        self.alternate_content_depth = 0
+        return True
+
+    def start(self, elem):
+        if elem.tag == self.alternate_content_tag:
+            self.alternate_content_depth += 1
+            return
+        if self.alternate_content_depth:
+            return
+
+        # Get the element name without namespace
+        tag = elem.tag.rpartition("}")[2].lower()
+        attr_name, scope = self.validator.UNIQUE_ID_REQUIREMENTS[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            if attr.rpartition("}")[2].lower() == attr_name:
+                id_value = value
+                break
+
+        if id_value is None:
+            return
+
+        if scope == "global":
+            # Check global uniqueness
+            self.check_global_id(self.xml_file, id_value, elem.sourceline, tag)
+            self.file_global_ids.append([id_value, elem.sourceline, tag])
+        elif scope == "file":
+            # Check file-level uniqueness
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.errors.append(
+                    f"  {self.xml_file.relative_to(self.validator.unpacked_dir)}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {ids[id_value]})"
+                )
+            else:
+                ids[id_value] = elem.sourceline
+
+    def end(self, elem):
+        self.alternate_content_depth -= 1
+
+    def end_file(self, xml_file):
+        self.validator._record_summary(xml_file, "global_ids", self.file_global_ids)
+
+
+class RelationshipIdCheck(TreeCheck):
+    """r:id attributes must reference IDs (of the right type) in the part's .rels."""
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.rid_attr = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+        self.attributes = frozenset([self.rid_attr])
+
+    def begin_file(self, xml_file):
+        # Skip .rels files themselves
+        if xml_file.suffix == ".rels":
+            return False
+
+        # Determine the corresponding .rels file
+        # For dir/file.xml, it's dir/_rels/file.xml.rels
+        rels_file = xml_file.parent / "_rels" / f"{xml_file.name}.rels"
+
+        # Skip if there's no corresponding .rels file (that's okay)
+        if not rels_file.exists():
+            return False
+
+        # Skip if neither file changed since the last passing run
+        validator = self.validator
+        if validator._is_unchanged(xml_file) and validator._is_unchanged(rels_file):
+            return False
+
+        try:
+            # Parse the .rels file to get valid relationship IDs and their types
+            rels_root = validator._parse(rels_file).getroot()
+            rid_to_type = {}
+
+            for rel in rels_root.findall(
+                f".//{{{validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+            ):
+                rid = rel.get("Id")
+                rel_type = rel.get("Type", "")
+                if rid:
+                    # Check for duplicate rIds
+                    if rid in rid_to_type:
+                        rels_rel_path = rels_file.relative_to(validator.unpacked_dir)
+                        self.errors.append(
+                            f"  {rels_rel_path}: Line {rel.sourceline}: "
+                            f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                        )
+                    # Extract just the type name from the full URL
+                    type_name = rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                    rid_to_type[rid] = type_name
+        except Exception as e:
+            self.file_error(xml_file, e)
+            return False
+
+        self.xml_rel_path = xml_file.relative_to(validator.unpacked_dir)
+        self.rid_to_type = rid_to_type
+        return True
+
+    def start(self, elem):
+        rid_attr = elem.get(self.rid_attr)
+        if not rid_attr:
+            return
+
+        rid_to_type = self.rid_to_type
+        elem_name = elem.tag.rpartition("}")[2]
+
+        # Check if the ID exists
+        if rid_attr not in rid_to_type:
+            self.errors.append(
+                f"  {self.xml_rel_path}: Line {elem.sourceline}: "
+                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        f"  {self.xml_rel_path}: Line {elem.sourceline}: "
+                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship"
+                    )
+
+    def file_error(self, xml_file, error):
+        xml_rel_path = xml_file.relative_to(self.validator.unpacked_dir)
+        self.errors.append(f"  Error processing {xml_rel_path}: {error}")
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -37,6 +286,13 @@ class BaseSchemaValidator:
         "grpsp": ("id", "file"),  # Group shape IDs
     }
 
+    # Element-level checks that share one traversal per part, by name.
+    # Subclasses extend this with their format-specific checks.
+    TREE_CHECKS = {
+        "unique_ids": UniqueIdCheck,
+        "relationship_ids": RelationshipIdCheck,
+    }
+
     # Mapping of element names to expected relationship types
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
@@ -103,13 +359,38 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        original_package=None,
+        baseline_memo=None,
+        jobs=1,
+        manifest_path=None,
+        streaming_threshold=DEFAULT_STREAMING_THRESHOLD,
+        tree_cache=None,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Number of worker processes for per-part XSD validation
+        self.jobs = max(1, jobs or 1)
+
+        # Size in bytes above which parts are streamed rather than loaded
+        # whole by the well-formedness, namespace, ID and other tree checks
+        # (None to never stream)
+        self.streaming_threshold = streaming_threshold
+
+        # Baseline view of the original file, shared by all checks of this run.
+        # A package passed in by the caller is shared with other validators and
+        # is closed by the caller, not by close().
+        self._owns_original = original_package is None
+        self.original = original_package or OriginalPackage(self.original_file)
+
         # Set schemas directory
-        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        self.schemas_dir = SCHEMAS_DIR
 
         # Get all XML and .rels files
         patterns = ["*.xml", "*.rels"]
@@ -120,18 +401,154 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by all checks of this run. A cache passed in by
+        # the caller is shared with other validators (e.g. the redlining check
+        # reuses document.xml) and is cleared by the caller, not by close().
+        self._owns_tree_cache = tree_cache is None
+        self._tree_cache = tree_cache or ParsedTreeCache()
+
+        # TREE_CHECKS instances, created by the first check that needs them
+        self._tree_checks = None
+
+        # On-disk memo of XSD errors in original parts, shared across runs,
+        # and the fingerprint of the schema files that is part of its keys
+        self.baseline_memo = baseline_memo or BaselineErrorMemo()
+        self._schemas_fingerprint = None
+
+        # Incremental mode: per-file checks are skipped for parts unchanged
+        # since the last passing run recorded in the manifest
+        self.manifest = (
+            ValidationManifest(manifest_path, type(self).__name__, self.original_file)
+            if manifest_path
+            else None
+        )
+
+    @classmethod
+    def warm_schema_cache(cls):
+        """Compile every schema in SCHEMA_MAPPINGS into the process-wide cache.
+
+        Long-lived workers can call this once at startup so that no validation
+        run pays the schema compile cost.
+
+        Returns:
+            int: Number of distinct schemas compiled successfully
+        """
+        compiled = 0
+        for schema_file in sorted(set(cls.SCHEMA_MAPPINGS.values())):
+            try:
+                load_schema(SCHEMAS_DIR / schema_file)
+                compiled += 1
+            except lxml.etree.XMLSchemaParseError:
+                # Reported per file by validate_against_xsd, like before
+                continue
+        return compiled
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _parse(self, xml_file):
+        """Parse an XML file through the shared tree cache.
+
+        The tree is shared with the other checks and must not be modified.
+        """
+        return self._tree_cache.parse(xml_file)
+
+    def _tree_check_errors(self, name):
+        """Return the errors found by one of TREE_CHECKS.
+
+        The first call runs every tree check in a single traversal per part;
+        later calls in the same run return the collected results.
+        """
+        if self._tree_checks is None:
+            self._tree_checks = {
+                check_name: check_class(self)
+                for check_name, check_class in self.TREE_CHECKS.items()
+            }
+            run_tree_checks(
+                self.xml_files,
+                list(self._tree_checks.values()),
+                self._parse,
+                self.streaming_threshold,
+            )
+        return self._tree_checks[name].errors
+
+    def _is_streamed(self, xml_file):
+        """Check whether a part is above the streaming threshold."""
+        return is_streamed(xml_file, self.streaming_threshold)
+
+    def _read_root(self, xml_file):
+        """Return the root element of a part.
+
+        Streamed parts are only read up to the root start tag, so the root
+        carries its tag, attributes and namespace declarations but no children.
+        """
+        if not self._is_streamed(xml_file):
+            return self._parse(xml_file).getroot()
+        for _, root in lxml.etree.iterparse(str(xml_file), events=("start",)):
+            return root
+
+    def report_cache_stats(self):
+        """Print cache statistics for this run (verbose mode only)."""
+        if self.verbose:
+            print(self._tree_cache.summary())
+            print(self.baseline_memo.summary())
+
+    def close(self):
+        """Free the per-run caches and the original package view."""
+        if self._owns_tree_cache:
+            self._tree_cache.clear()
+        self._tree_checks = None
+        if self._owns_original:
+            self.original.close()
+
+    def finish_run(self, passed):
+        """End a validation run.
+
+        Reports cache statistics, records the manifest if the run passed in
+        incremental mode, and frees the per-run caches.
+        """
+        self.report_cache_stats()
+        if passed and self.manifest is not None:
+            self.manifest.save(
+                {self._relative_path(f): f for f in self.xml_files}
+            )
+        self.close()
+
+    def _relative_path(self, xml_file):
+        """Return the package path of a file (e.g. "word/document.xml")."""
+        return Path(xml_file).relative_to(self.unpacked_dir).as_posix()
+
+    def _is_unchanged(self, xml_file):
+        """Check whether a file is unchanged since the last passing incremental run."""
+        return self.manifest is not None and self.manifest.is_unchanged(
+            self._relative_path(xml_file), xml_file
+        )
+
+    def _previous_summary(self, xml_file, key, default=None):
+        """Return a per-file summary value from the last passing run."""
+        return self.manifest.previous_summary(
+            self._relative_path(xml_file), key, default
+        )
+
+    def _record_summary(self, xml_file, key, value):
+        """Record a per-file summary value for the manifest (incremental mode only)."""
+        if self.manifest is not None:
+            self.manifest.record_summary(self._relative_path(xml_file), key, value)
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
+            if self._is_unchanged(xml_file):
+                continue
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                if self._is_streamed(xml_file):
+                    check_well_formed(xml_file)
+                else:
+                    self._parse(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -158,8 +575,10 @@ class BaseSchemaValidator:
         errors = []
 
         for xml_file in self.xml_files:
+            if self._is_unchanged(xml_file):
+                continue
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._read_root(xml_file)
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -185,84 +604,7 @@ class BaseSchemaValidator:
 
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
-
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._tree_check_errors("unique_ids")
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -310,7 +652,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -390,87 +732,7 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
-        errors = []
-
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
-
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
-
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+        errors = self._tree_check_errors("relationship_ids")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -531,7 +793,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -593,8 +855,14 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
+                    if self._is_unchanged(xml_file):
+                        root_name = self._previous_summary(xml_file, "root_name")
+                    else:
+                        root_tag = self._read_root(xml_file).tag
+                        root_name = (
+                            root_tag.split("}")[-1] if "}" in root_tag else root_tag
+                        )
+                        self._record_summary(xml_file, "root_name", root_name)
 
                     if root_name in declarable_roots and path_str not in declared_parts:
                         errors.append(
@@ -673,7 +941,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +960,29 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
+        # Files unchanged since the last passing run are known to be valid
+        changed_files = [f for f in self.xml_files if not self._is_unchanged(f)]
+
+        if self.jobs > 1 and len(changed_files) > 1:
+            changed_results = self._validate_files_in_pool(changed_files)
+        else:
+            changed_results = [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in changed_files
+            ]
+        changed_results = dict(zip(changed_files, changed_results))
+
+        results = []
         for xml_file in self.xml_files:
+            if xml_file in changed_results:
+                results.append(changed_results[xml_file])
+            elif self._get_schema_path(xml_file.relative_to(self.unpacked_dir)):
+                results.append((True, set()))
+            else:
+                results.append((None, set()))  # Skipped (no schema)
+
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +998,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +1024,31 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_in_pool(self, xml_files):
+        """Validate files against XSD in a process pool.
+
+        Results are returned in the order of xml_files, so the report matches
+        a serial run exactly.
+
+        Returns:
+            list: (is_valid, new_errors_set) per file, as validate_file_against_xsd
+        """
+        memo_settings = (self.baseline_memo.cache_dir, self.baseline_memo.max_bytes)
+        chunksize = max(1, len(xml_files) // (self.jobs * 4))
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_xsd_worker,
+            initargs=(type(self), self.unpacked_dir, self.original_file, memo_settings),
+        ) as executor:
+            for is_valid, new_errors, hits, misses in executor.map(
+                _validate_file_in_worker, xml_files, chunksize=chunksize
+            ):
+                self.baseline_memo.hits += hits
+                self.baseline_memo.misses += misses
+                results.append((is_valid, new_errors))
+        return results
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -825,32 +1136,41 @@ class BaseSchemaValidator:
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
-        schema_path = self._get_schema_path(xml_file)
-        if not schema_path:
+        relative_path = xml_file.relative_to(base_path)
+        if not self._get_schema_path(relative_path):
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self._parse(xml_file)
+        except Exception as e:
+            return False, {str(e)}
+
+        return self._validate_tree_xsd(xml_doc, relative_path)
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+    def _validate_tree_xsd(self, xml_doc, relative_path):
+        """Validate a parsed XML tree against the XSD schema for its package path.
+
+        Args:
+            xml_doc: Parsed tree (not modified; preprocessing works on a copy)
+            relative_path: Path of the part relative to the package root
 
+        Returns:
+            tuple: (is_valid, errors_set), or (None, None) if no schema applies
+        """
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return None, None  # Skip file
+
+        try:
+            # Load schema (compiled once per process)
+            schema = load_schema(schema_path)
+
+            # Preprocess XML (the template tag pass works on a copy)
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
+            if self._is_main_content(relative_path):
                 xml_doc = self._clean_ignorable_namespaces(xml_doc)
 
             # Validate
@@ -869,39 +1189,73 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read from the shared original package view, so the
+        original file is never extracted to disk.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        member = relative_path.as_posix()
+
+        if not self.original.has(member):
+            # File didn't exist in original, so no original errors
+            return set()
+
+        # Errors depend only on the part bytes and the schema, so reuse the
+        # result of an earlier run on the same original if there is one
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
+        part_sha256 = hashlib.sha256(self.original.read(member)).hexdigest()
+        context = (
+            type(self).__name__,
+            f"main_content={self._is_main_content(relative_path)}",
+            self._get_schemas_fingerprint(),
+        )
+        errors = self.baseline_memo.get(part_sha256, schema_path, context)
+        if errors is not None:
+            return errors
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        # Validate the specific file in original
+        try:
+            xml_doc = self.original.parse(member)
+            is_valid, errors = self._validate_tree_xsd(xml_doc, relative_path)
+        except Exception as e:
+            errors = {str(e)}
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+        errors = errors if errors else set()
+        self.baseline_memo.put(part_sha256, schema_path, context, errors)
+        return errors
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+    def _is_main_content(self, relative_path):
+        """Check whether a part is in a main content folder (word/, ppt/, xl/)."""
+        return bool(relative_path.parts) and (
+            relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+    def _get_schemas_fingerprint(self):
+        """Return a hash of the names, sizes and mtimes of all schema files.
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        Schemas import and include each other, so a change to any file of
+        schemas_dir can change the errors of any part.
+        """
+        if self._schemas_fingerprint is None:
+            digest = hashlib.sha256()
+            for path in sorted(self.schemas_dir.rglob("*")):
+                if path.is_file():
+                    stat = path.stat()
+                    relative = path.relative_to(self.schemas_dir).as_posix()
+                    entry = f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n"
+                    digest.update(entry.encode())
+            self._schemas_fingerprint = digest.hexdigest()
+        return self._schemas_fingerprint
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
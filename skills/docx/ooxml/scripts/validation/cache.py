@@ -0,0 +1,255 @@
+"""
+Caches shared by the validation checks of a single validator run.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+
+class ParsedTreeCache:
+    """Cache of parsed XML trees keyed by path and invalidated by mtime and size.
+
+    All checks share the cached instance, so cached trees are read-only: a
+    check that needs to change a tree (e.g. to strip mc:AlternateContent) must
+    work on its own copy, so the checks that run after it see the file as it is.
+    """
+
+    def __init__(self):
+        # path -> (mtime_ns, size, tree, parse_seconds)
+        self._entries = {}
+        self.parse_count = 0
+        self.hit_count = 0
+        self.parse_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def parse(self, xml_file):
+        """Return the parsed tree for xml_file, parsing it only if needed.
+
+        Args:
+            xml_file: Path to the XML file
+
+        Returns:
+            lxml.etree._ElementTree: The shared parsed tree (read-only)
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the file is not well-formed
+        """
+        key = str(xml_file)
+        stat = Path(xml_file).stat()
+        entry = self._entries.get(key)
+
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            tree = entry[2]
+            self.hit_count += 1
+            self.saved_seconds += entry[3]
+        else:
+            start = time.perf_counter()
+            tree = lxml.etree.parse(key)
+            elapsed = time.perf_counter() - start
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, tree, elapsed)
+            self.parse_count += 1
+            self.parse_seconds += elapsed
+
+        return tree
+
+    def clear(self):
+        """Drop all cached trees (statistics are kept)."""
+        self._entries.clear()
+
+    def summary(self):
+        """Return a one-line description of parse counts and time saved."""
+        return (
+            f"Parsed {self.parse_count} XML files in {self.parse_seconds:.2f}s, "
+            f"reused cached trees {self.hit_count} times "
+            f"(~{self.saved_seconds:.2f}s saved)"
+        )
+
+
+class OriginalPackage:
+    """Read-only view of the original Office file used as validation baseline.
+
+    The zip is opened lazily on first use and members are read directly with
+    ZipFile.open() instead of being extracted to disk. Parsed member trees are
+    cached, so the XSD, paragraph count and redlining checks of one run share a
+    single view. Call close() (or use it as a context manager) to free it.
+    """
+
+    def __init__(self, original_file):
+        self.original_file = Path(original_file)
+        self._zip = None
+        self._members = None
+        self._trees = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open_zip(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.original_file, "r")
+            self._members = set(self._zip.namelist())
+        return self._zip
+
+    def has(self, member):
+        """Check whether the package contains a member (e.g. "word/document.xml")."""
+        self._open_zip()
+        return member in self._members
+
+    def open(self, member):
+        """Open a member for reading as a binary file object."""
+        return self._open_zip().open(member)
+
+    def read(self, member):
+        """Read the raw bytes of a member."""
+        return self._open_zip().read(member)
+
+    def parse(self, member):
+        """Parse a member, reusing the tree parsed earlier in this run.
+
+        Args:
+            member: Member name inside the package
+
+        Returns:
+            lxml.etree._ElementTree: The shared parsed tree (read-only)
+
+        Raises:
+            KeyError: If the member does not exist
+            lxml.etree.XMLSyntaxError: If the member is not well-formed
+        """
+        if member not in self._trees:
+            with self.open(member) as f:
+                self._trees[member] = lxml.etree.parse(f)
+        return self._trees[member]
+
+    def close(self):
+        """Close the zip file and drop all parsed trees."""
+        if self._zip is not None:
+            self._zip.close()
+        self._zip = None
+        self._members = None
+        self._trees.clear()
+
+
+class BaselineErrorMemo:
+    """On-disk memo of XSD error sets for parts of the original document.
+
+    The errors of an original part depend only on its bytes, the schemas and
+    how the validator prepares the part, so they are stored under (VERSION,
+    part SHA-256, schema path, context), where the caller's context covers the
+    rest: the validator class, the preprocessing options and a fingerprint of
+    the schema files. Entries are reused by every later validation of edits to
+    the same source document. They are small JSON files; when the store grows
+    beyond max_bytes the least recently used entries are evicted. Storage
+    problems never fail a validation, they just turn into cache misses.
+
+    The store lives in the OOXML_VALIDATION_CACHE directory if that environment
+    variable is set, otherwise in ooxml-validation under the user's cache
+    directory ($XDG_CACHE_HOME or ~/.cache). Since its entries hide errors, it is
+    created private to the user, and a directory that another user owns or can
+    write to is not used at all.
+    """
+
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+    # Part of every key; bump it when the preprocessing before XSD validation
+    # or the form of the stored errors changes, so that old entries are unused
+    VERSION = 2
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(
+            cache_dir
+            or os.environ.get("OOXML_VALIDATION_CACHE")
+            or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+            / "ooxml-validation"
+        )
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Whether cache_dir is safe to use, checked on first access
+        self._usable = None
+
+    def _is_usable(self):
+        """Create cache_dir if needed and check that only this user controls it."""
+        if self._usable is None:
+            try:
+                self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                stat = self.cache_dir.stat()
+                self._usable = not (stat.st_mode & 0o022) and (
+                    not hasattr(os, "getuid") or stat.st_uid == os.getuid()
+                )
+            except OSError:
+                self._usable = False
+        return self._usable
+
+    def _entry_path(self, part_sha256, schema_path, context):
+        key = "\0".join([str(self.VERSION), part_sha256, str(schema_path), *context])
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, part_sha256, schema_path, context):
+        """Return the memoized error set, or None on a miss.
+
+        Args:
+            part_sha256: Hex SHA-256 of the part's bytes
+            schema_path: Path of the schema the part is validated against
+            context: Strings for everything else the errors depend on
+        """
+        if not self._is_usable():
+            self.misses += 1
+            return None
+        try:
+            entry = self._entry_path(part_sha256, schema_path, context)
+            errors = set(json.loads(entry.read_text(encoding="utf-8")))
+            os.utime(entry)  # Mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return errors
+
+    def put(self, part_sha256, schema_path, context, errors):
+        """Store the error set for a part (see get), evicting old entries if needed."""
+        if not self._is_usable():
+            return
+        try:
+            entry = self._entry_path(part_sha256, schema_path, context)
+            fd, temp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(sorted(errors), f)
+            os.replace(temp_name, entry)
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove least recently used entries until the store fits max_bytes."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+            total += stat.st_size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def summary(self):
+        """Return a one-line description of hit and miss counts."""
+        return f"Baseline XSD error memo: {self.hits} hits, {self.misses} misses"
@@ -3,28 +3,129 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
-
-import lxml.etree
 
 from .base import BaseSchemaValidator
+from .traversal import TreeCheck
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _text_preview(text):
+    """Return repr(text), truncated for error messages."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class DocumentBodyCheck(TreeCheck):
+    """Base for checks that only look at changed document.xml parts."""
+
+    def begin_file(self, xml_file):
+        if xml_file.name != "document.xml" or self.validator._is_unchanged(xml_file):
+            return False
+        self.xml_rel_path = xml_file.relative_to(self.validator.unpacked_dir)
+        return True
+
+
+class WhitespacePreservationCheck(DocumentBodyCheck):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    end_tags = frozenset([f"{{{WORD_2006_NAMESPACE}}}t"])
+    leading_space = re.compile(r"^\s.*")
+    trailing_space = re.compile(r".*\s$")
+
+    def end(self, elem):
+        text = elem.text
+        if not text:
+            return
+        # Check if text starts or ends with whitespace
+        if self.leading_space.match(text) or self.trailing_space.match(text):
+            # Check if xml:space="preserve" attribute exists
+            xml_space_attr = f"{{{self.validator.XML_NAMESPACE}}}space"
+            if elem.get(xml_space_attr) != "preserve":
+                self.errors.append(
+                    f"  {self.xml_rel_path}: "
+                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+                )
+
+
+class DeletionCheck(DocumentBodyCheck):
+    """w:t elements must not appear within w:del elements."""
+
+    del_tag = f"{{{WORD_2006_NAMESPACE}}}del"
+    t_tag = f"{{{WORD_2006_NAMESPACE}}}t"
+    tags = frozenset([del_tag])
+    end_tags = frozenset([del_tag, t_tag])
+
+    def begin_file(self, xml_file):
+        self.del_depth = 0
+        return super().begin_file(xml_file)
+
+    def start(self, elem):
+        self.del_depth += 1
+
+    def end(self, elem):
+        if elem.tag == self.del_tag:
+            self.del_depth -= 1
+        elif self.del_depth and elem.text:
+            self.errors.append(
+                f"  {self.xml_rel_path}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+
+class InsertionCheck(DocumentBodyCheck):
+    """w:delText elements within w:ins must be nested in a w:del."""
+
+    ins_tag = f"{{{WORD_2006_NAMESPACE}}}ins"
+    del_tag = f"{{{WORD_2006_NAMESPACE}}}del"
+    del_text_tag = f"{{{WORD_2006_NAMESPACE}}}delText"
+    tags = frozenset([ins_tag, del_tag])
+    end_tags = frozenset([ins_tag, del_tag, del_text_tag])
+
+    def begin_file(self, xml_file):
+        self.ins_depth = 0
+        self.del_depth = 0
+        return super().begin_file(xml_file)
+
+    def start(self, elem):
+        if elem.tag == self.ins_tag:
+            self.ins_depth += 1
+        else:
+            self.del_depth += 1
+
+    def end(self, elem):
+        if elem.tag == self.ins_tag:
+            self.ins_depth -= 1
+        elif elem.tag == self.del_tag:
+            self.del_depth -= 1
+        elif self.ins_depth and not self.del_depth:
+            self.errors.append(
+                f"  {self.xml_rel_path}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
     """Validator for Word document XML files against XSD schemas."""
 
     # Word-specific namespace
-    WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    WORD_2006_NAMESPACE = WORD_2006_NAMESPACE
 
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    TREE_CHECKS = {
+        **BaseSchemaValidator.TREE_CHECKS,
+        "whitespace_preservation": WhitespacePreservationCheck,
+        "deletions": DeletionCheck,
+        "insertions": InsertionCheck,
+    }
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
         if not self.validate_xml():
+            self.finish_run(False)
             return False
 
         # Test 1: Namespace declarations
@@ -67,49 +168,14 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         # Count and compare paragraphs
         self.compare_paragraph_counts()
 
+        self.finish_run(all_valid)
         return all_valid
 
     def validate_whitespace_preservation(self):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._tree_check_errors("whitespace_preservation")
 
         if errors:
             print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
@@ -126,39 +192,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._tree_check_errors("deletions")
 
         if errors:
             print(f"FAILED - Found {len(errors)} deletion validation violations:")
@@ -179,11 +213,16 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
+            if self._is_unchanged(xml_file):
+                count = self._previous_summary(xml_file, "paragraphs", 0)
+                continue
+
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse(xml_file).getroot()
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
                 count = len(paragraphs)
+                self._record_summary(xml_file, "paragraphs", count)
             except Exception as e:
                 print(f"Error counting paragraphs in unpacked document: {e}")
 
@@ -191,22 +230,23 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
     def count_paragraphs_in_original(self):
         """Count the number of paragraphs in the original docx file."""
+        # The original is fixed for the lifetime of a manifest
+        if self.manifest is not None:
+            count = self.manifest.previous_value("original_paragraphs")
+            if count is not None:
+                return count
+
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml from the shared original package view
+            root = self.original.parse("word/document.xml").getroot()
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
+            if self.manifest is not None:
+                self.manifest.record_value("original_paragraphs", count)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -218,37 +258,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._tree_check_errors("insertions")
 
         if errors:
             print(f"FAILED - Found {len(errors)} insertion validation violations:")
@@ -0,0 +1,118 @@
+"""
+Manifest of the last passing validation run, used for incremental validation.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+class ValidationManifest:
+    """Part hashes and per-file summaries from the last passing validation run.
+
+    A part whose SHA-256 matches the manifest passed every per-file check last
+    time, so those checks can be skipped. Cross-file checks (global IDs,
+    content types, paragraph counts) are recomputed from the per-file
+    summaries stored alongside each hash.
+
+    The manifest is only reused when it was written by the same validator for
+    the same original file (path, size and mtime); otherwise every part counts
+    as changed.
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_path, validator_name, original_file):
+        self.manifest_path = Path(manifest_path)
+        original_file = Path(original_file)
+        original_stat = original_file.stat()
+        self._context = {
+            "version": self.VERSION,
+            "validator": validator_name,
+            "original": [
+                str(original_file.resolve()),
+                original_stat.st_size,
+                original_stat.st_mtime_ns,
+            ],
+        }
+        self._previous_parts, self._previous_values = self._load()
+        self._hashes = {}  # relative path -> SHA-256 of the part in this run
+        self._summaries = {}  # relative path -> summary recorded in this run
+        self._values = {}  # document-level values recorded in this run
+
+    def _load(self):
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}, {}
+        if not isinstance(data, dict) or data.get("context") != self._context:
+            return {}, {}
+        return data.get("parts", {}), data.get("values", {})
+
+    def part_hash(self, relative_path, xml_file):
+        """Return the SHA-256 of a part, hashing it at most once per run."""
+        if relative_path not in self._hashes:
+            digest = hashlib.sha256(Path(xml_file).read_bytes()).hexdigest()
+            self._hashes[relative_path] = digest
+        return self._hashes[relative_path]
+
+    def is_unchanged(self, relative_path, xml_file):
+        """Check whether a part is byte-identical to the last passing run."""
+        entry = self._previous_parts.get(relative_path)
+        return entry is not None and entry["sha256"] == self.part_hash(
+            relative_path, xml_file
+        )
+
+    def previous_summary(self, relative_path, key, default=None):
+        """Return a per-file summary value recorded by the last passing run."""
+        entry = self._previous_parts.get(relative_path, {})
+        return entry.get("summary", {}).get(key, default)
+
+    def record_summary(self, relative_path, key, value):
+        """Record a per-file summary value (must be JSON serializable)."""
+        self._summaries.setdefault(relative_path, {})[key] = value
+
+    def previous_value(self, key, default=None):
+        """Return a document-level value recorded by the last passing run."""
+        return self._previous_values.get(key, default)
+
+    def record_value(self, key, value):
+        """Record a document-level value (must be JSON serializable)."""
+        self._values[key] = value
+
+    def save(self, parts):
+        """Write the manifest after a passing run.
+
+        Summaries of unchanged parts that were not recomputed in this run are
+        carried over from the previous manifest.
+
+        Args:
+            parts: Dict mapping relative path to file path for every part
+        """
+        entries = {}
+        for relative_path, xml_file in parts.items():
+            summary = {}
+            if self.is_unchanged(relative_path, xml_file):
+                summary.update(self._previous_parts[relative_path].get("summary", {}))
+            summary.update(self._summaries.get(relative_path, {}))
+            entries[relative_path] = {
+                "sha256": self.part_hash(relative_path, xml_file),
+                "summary": summary,
+            }
+
+        values = dict(self._previous_values)
+        values.update(self._values)
+        data = {"context": self._context, "parts": entries, "values": values}
+
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(
+                dir=self.manifest_path.parent, suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_name, self.manifest_path)
+        except OSError:
+            pass
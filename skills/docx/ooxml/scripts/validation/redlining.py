@@ -2,23 +2,58 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import hashlib
+from itertools import zip_longest
 from pathlib import Path
 
+import lxml.etree
+
+from .cache import OriginalPackage, ParsedTreeCache
+from .manifest import ValidationManifest
+from .worddiff import diff, render_hunks, word_diff
+
+
+# Characters git treats as whitespace when it measures indentation
+_SPACE = " \t\n\r"
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
+    def __init__(
+        self,
+        unpacked_dir,
+        original_docx,
+        verbose=False,
+        original_package=None,
+        manifest_path=None,
+        tree_cache=None,
+    ):
+        self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
 
+        # Baseline view of the original docx; a package passed in by the caller
+        # is shared with other validators and is closed by the caller.
+        self._owns_original = original_package is None
+        self.original = original_package or OriginalPackage(self.original_docx)
+
+        # Parsed trees of the unpacked parts; pass the schema validator's cache
+        # so document.xml is parsed once for both checks
+        self.tree_cache = tree_cache or ParsedTreeCache()
+
+        # Incremental mode: skip the comparison while document.xml is unchanged
+        # since the last passing run recorded in the manifest
+        self.manifest = (
+            ValidationManifest(manifest_path, type(self).__name__, self.original_docx)
+            if manifest_path
+            else None
+        )
+
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
         # Verify unpacked directory exists and has correct structure
@@ -27,92 +62,81 @@ class RedliningValidator:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
+        if self.manifest is not None and self.manifest.is_unchanged(
+            "word/document.xml", modified_file
+        ):
+            if self.verbose:
+                print("PASSED - document.xml unchanged since last passing run")
+            return True
+
+        passed = self._validate_document(modified_file)
+        if passed and self.manifest is not None:
+            self.manifest.save({"word/document.xml": modified_file})
+        return passed
+
+    def _validate_document(self, modified_file):
+        """Check that all changes by GLM in modified_file are properly tracked."""
         # First, check if there are any tracked changes by GLM to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by GLM
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by GLM
-            glm_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "GLM"
-            ]
-            glm_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "GLM"
-            ]
+            root = self.tree_cache.parse(modified_file).getroot()
 
             # Redlining validation is only needed if tracked changes by GLM have been used.
-            if not glm_del_elements and not glm_ins_elements:
+            if not self._has_glm_tracked_changes(root):
                 if self.verbose:
                     print("PASSED - No tracked changes by GLM found.")
                 return True
 
-        except Exception:
+        except lxml.etree.XMLSyntaxError:
             # If we can't parse the XML, continue with full validation
             pass
 
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
+        try:
+            return self._compare_with_original(modified_file)
+        finally:
+            if self._owns_original:
+                self.original.close()
+
+    def _compare_with_original(self, modified_file):
+        """Compare document text with the original after removing GLM's changes."""
+        # Read original document.xml directly from the original package
+        try:
+            has_document = self.original.has("word/document.xml")
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return False
 
-            # Remove GLM's tracked changes from both documents
-            self._remove_glm_tracked_changes(original_root)
-            self._remove_glm_tracked_changes(modified_root)
+        if not has_document:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return False
 
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+        # Both trees are only read, so the cached ones are used as they are
+        try:
+            modified_root = self.tree_cache.parse(modified_file).getroot()
+            original_root = self.original.parse("word/document.xml").getroot()
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
-            if modified_text != original_text:
+        # Compare the paragraphs of both documents as they read without GLM's
+        # tracked changes, one pair at a time, so no text is kept
+        paragraph_pairs = zip_longest(
+            self._iter_paragraph_texts(original_root),
+            self._iter_paragraph_texts(modified_root),
+            fillvalue=(None, None),
+        )
+        if any(text1 != text2 for (_, text1), (_, text2) in paragraph_pairs):
+            differences = self._get_word_diff(original_root, modified_root)
+            if differences is not None:
                 # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
+                print(self._generate_detailed_diff(differences))
                 return False
 
-            if self.verbose:
-                print("PASSED - All changes by GLM are properly tracked")
-            return True
+        if self.verbose:
+            print("PASSED - All changes by GLM are properly tracked")
+        return True
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+    def _generate_detailed_diff(self, differences):
+        """Generate the failure message for a word diff of the document text."""
         error_parts = [
             "FAILED - Document text doesn't match after removing GLM's tracked changes",
             "",
@@ -127,152 +151,180 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
+        # Show word diff
+        if differences:
+            error_parts.extend(["Differences:", "============", differences])
         else:
-            error_parts.append("Unable to generate word diff (git not available)")
+            error_parts.append("Unable to generate word diff")
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
+    def _get_word_diff(self, original_root, modified_root):
+        """Generate a word diff with character-level precision.
 
-        return None
+        The diff is the same as word_diff of the document text (the non-empty
+        paragraphs joined with newlines), but only the text of the paragraphs
+        that differ is built: the others are compared by fingerprint.
 
-    def _remove_glm_tracked_changes(self, root):
-        """Remove tracked changes authored by GLM from the XML root."""
+        Returns:
+            str: The diff ("" if it shows nothing), or None if the text is the same
+        """
+        original_paragraphs = self._read_paragraphs(original_root)
+        modified_paragraphs = self._read_paragraphs(modified_root)
+
+        if any(p.multiline for p in original_paragraphs + modified_paragraphs):
+            # Line breaks inside paragraphs split them into several lines of
+            # the text, so the whole text is compared and diffed instead
+            original_text = "\n".join(
+                text for _, text in self._iter_paragraph_texts(original_root)
+            )
+            modified_text = "\n".join(
+                text for _, text in self._iter_paragraph_texts(modified_root)
+            )
+            if original_text == modified_text:
+                return None
+            # Character-level diff first for precise differences, then word-level
+            return word_diff(original_text, modified_text) or word_diff(
+                original_text, modified_text, characters=False
+            )
+
+        # Diff the paragraphs by fingerprint, then build the lines of the
+        # changed paragraphs only
+        hunks = diff(
+            self._line_records(original_paragraphs),
+            self._line_records(modified_paragraphs),
+            indent_heuristic=True,
+            line_starts=(
+                [p.start for p in original_paragraphs],
+                [p.start for p in modified_paragraphs],
+            ),
+        )
+        original_lines = self._paragraph_lines(
+            original_paragraphs,
+            [i for i1, chg1, _, _ in hunks for i in range(i1, i1 + chg1)],
+        )
+        modified_lines = self._paragraph_lines(
+            modified_paragraphs,
+            [i for _, _, i2, chg2 in hunks for i in range(i2, i2 + chg2)],
+        )
+        return render_hunks(hunks, original_lines, modified_lines) or render_hunks(
+            hunks, original_lines, modified_lines, characters=False
+        )
+
+    def _line_records(self, paragraphs):
+        """Return the diff records standing for the lines of the paragraphs."""
+        records = [p.digest for p in paragraphs]
+        if records:
+            # The last line has no newline, which sets it apart from the same
+            # text elsewhere (as in word_diff)
+            records[-1] = (records[-1], None)
+        return records
+
+    def _paragraph_lines(self, paragraphs, indexes):
+        """Return {index: line} for the paragraphs at indexes, with newlines."""
+        last = len(paragraphs) - 1
+        lines = {}
+        for index in indexes:
+            text = self._paragraph_text(paragraphs[index].element)
+            lines[index] = text if index == last else text + "\n"
+        return lines
+
+    def _read_paragraphs(self, root):
+        """Return a _Paragraph fingerprint for each non-empty paragraph."""
+        paragraph_texts = self._iter_paragraph_texts(root)
+        return [_Paragraph(p_elem, text) for p_elem, text in paragraph_texts]
+
+    def _iter_paragraph_texts(self, root):
+        """Yield (w:p, text) for each paragraph as it reads without GLM's changes.
+
+        The tree is left as it is. Like the text of a document, a paragraph
+        includes the text of paragraphs nested in it, and empty paragraphs are
+        skipped (tracked insertions may add them without any text).
+        """
         ins_tag = f"{{{self.namespaces['w']}}}ins"
         del_tag = f"{{{self.namespaces['w']}}}del"
+        p_tag = f"{{{self.namespaces['w']}}}p"
+        t_tag = f"{{{self.namespaces['w']}}}t"
         author_attr = f"{{{self.namespaces['w']}}}author"
 
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "GLM":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
+        # Paragraphs around or inside GLM's changes are read element by
+        # element; all others are just the text of their w:t
+        changed = set()
+        for change in root.iter(ins_tag, del_tag):
+            if change.get(author_attr) == "GLM":
+                changed.update(change.iterancestors(p_tag))
+                changed.update(change.iter(p_tag))
+
+        for p_elem in root.iter(p_tag):
+            if p_elem in changed:
+                text = self._paragraph_text(p_elem)
+            else:
+                text = "".join([t_elem.text or "" for t_elem in p_elem.iter(t_tag)])
+            # Skip empty paragraphs - they don't affect content validation
+            if text:
+                yield p_elem, text
 
-        # Unwrap content in w:del elements where author is "GLM"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
+    def _paragraph_text(self, p_elem):
+        """Return the text of a paragraph with GLM's tracked changes removed.
 
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "GLM":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
-
-        Empty paragraphs are skipped to avoid false positives when tracked
-        insertions add only structural elements without text content.
+        w:ins by GLM are skipped (with the whole paragraph if it is inside
+        one), and w:delText inside w:del by GLM is read as w:t.
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
+        ins_tag = f"{{{self.namespaces['w']}}}ins"
+        del_tag = f"{{{self.namespaces['w']}}}del"
         t_tag = f"{{{self.namespaces['w']}}}t"
+        deltext_tag = f"{{{self.namespaces['w']}}}delText"
+        author_attr = f"{{{self.namespaces['w']}}}author"
 
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
+        glm_deletions = 0
+        for ancestor in p_elem.iterancestors(ins_tag, del_tag):
+            if ancestor.get(author_attr) == "GLM":
+                if ancestor.tag == ins_tag:
+                    return ""
+                glm_deletions += 1
+
+        text_parts = []
+        tags = (ins_tag, del_tag, t_tag, deltext_tag)
+        walker = lxml.etree.iterwalk(p_elem, events=("start", "end"), tag=tags)
+        for event, elem in walker:
+            tag = elem.tag
+            if tag == t_tag or tag == deltext_tag:
+                if event == "start" and elem.text and (tag == t_tag or glm_deletions):
+                    text_parts.append(elem.text)
+            elif elem.get(author_attr) != "GLM":
+                continue
+            elif tag == ins_tag:
+                if event == "start":
+                    walker.skip_subtree()
+            elif event == "start":
+                glm_deletions += 1
+            else:
+                glm_deletions -= 1
+        return "".join(text_parts)
+
+    def _has_glm_tracked_changes(self, root):
+        """Check whether the XML root contains w:ins or w:del authored by GLM."""
+        ins_tag = f"{{{self.namespaces['w']}}}ins"
+        del_tag = f"{{{self.namespaces['w']}}}del"
+        author_attr = f"{{{self.namespaces['w']}}}author"
+        return any(
+            elem.get(author_attr) == "GLM" for elem in root.iter(ins_tag, del_tag)
+        )
+
+
+class _Paragraph:
+    """Fingerprint of the text of one paragraph, for diffing documents."""
+
+    __slots__ = ("element", "digest", "start", "multiline")
 
-        return "\n".join(paragraphs)
+    def __init__(self, element, text):
+        self.element = element
+        self.digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        # Text up to and including its first non-whitespace character, which
+        # gives the indentation for the diff
+        self.start = text[: len(text) - len(text.lstrip(_SPACE)) + 1]
+        # Whether the text contains line breaks
+        self.multiline = "\n" in text
 
 
 if __name__ == "__main__":
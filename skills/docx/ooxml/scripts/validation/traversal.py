@@ -0,0 +1,229 @@
+"""
+Single-pass traversal that runs several element-level checks over each part.
+"""
+
+from pathlib import Path
+
+import lxml.etree
+
+
+class TreeCheck:
+    """An element-level check run by run_tree_checks.
+
+    Instead of walking every tree itself, a check declares which elements it
+    is interested in and the engine calls it during one shared walk per part:
+
+      tags          Clark-notation tags whose start events call start()
+      local_names   Lowercase local names (any namespace) that call start()
+      attributes    Clark-notation attribute names; elements carrying any of
+                    them call start()
+      all_elements  If True, start() is called for every element
+      end_tags      Clark-notation tags whose end events call end()
+
+    start() is called at most once per element, in document order. Checks
+    that track ancestors (e.g. "inside w:del") count them with start() and
+    end() on the ancestor tag. Errors are collected in self.errors. If start(),
+    end() or end_file() raises, the exception is passed to file_error() and the
+    check gets no more events for that part; the other checks are unaffected.
+    """
+
+    tags = frozenset()
+    local_names = frozenset()
+    attributes = frozenset()
+    all_elements = False
+    end_tags = frozenset()
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+
+    def begin_file(self, xml_file):
+        """Prepare for a part. Return False to skip it."""
+        return True
+
+    def start(self, elem):
+        """Handle the start of an element this check is interested in."""
+
+    def end(self, elem):
+        """Handle the end of an element whose tag is in end_tags."""
+
+    def end_file(self, xml_file):
+        """Finish a part that was walked completely."""
+
+    def file_error(self, xml_file, error):
+        """Record a part that could not be parsed or walked."""
+        self.errors.append(
+            f"  {xml_file.relative_to(self.validator.unpacked_dir)}: Error: {error}"
+        )
+
+
+def run_tree_checks(xml_files, checks, parse, streaming_threshold=None):
+    """Run checks over xml_files with a single traversal per part.
+
+    Parts that no check wants (see TreeCheck.begin_file) are not parsed.
+    Parts larger than streaming_threshold bytes are read with iterparse and
+    their elements are freed as soon as they end, so memory use stays bounded
+    by the document depth rather than the part size. Element text is then only
+    complete in end(), which is where checks that read text must look at it.
+
+    Args:
+        xml_files: Paths of the parts, visited in this order
+        checks: TreeCheck instances
+        parse: Callable returning the parsed tree of a part
+        streaming_threshold: Size in bytes above which parts are streamed,
+            or None to never stream
+    """
+    for xml_file in xml_files:
+        active = [check for check in checks if check.begin_file(xml_file)]
+        if not active:
+            continue
+
+        # check -> exception raised by one of its handlers
+        failed = {}
+        try:
+            if is_streamed(xml_file, streaming_threshold):
+                _dispatch(iterparse_events(xml_file), active, failed)
+            else:
+                root = parse(xml_file).getroot()
+                events = ("start", "end") if _end_handlers(active) else ("start",)
+                _dispatch(lxml.etree.iterwalk(root, events=events), active, failed)
+        except (lxml.etree.XMLSyntaxError, OSError) as e:
+            # The part could not be read, which concerns every check
+            for check in active:
+                check.file_error(xml_file, failed.get(check, e))
+            continue
+
+        for check in active:
+            if check in failed:
+                check.file_error(xml_file, failed[check])
+                continue
+            try:
+                check.end_file(xml_file)
+            except Exception as e:
+                check.file_error(xml_file, e)
+
+
+def is_streamed(xml_file, streaming_threshold):
+    """Check whether a part is large enough to be read in streaming mode."""
+    return (
+        streaming_threshold is not None
+        and Path(xml_file).stat().st_size > streaming_threshold
+    )
+
+
+def iterparse_events(xml_file):
+    """Yield ("start"|"end", element) events for a part without building its tree.
+
+    Each element is cleared after its end event has been handled, and finished
+    siblings are detached from their parent, so only the path from the root to
+    the current element stays in memory.
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part is not well-formed
+    """
+    for event, elem in lxml.etree.iterparse(str(xml_file), events=("start", "end")):
+        yield event, elem
+        if event == "end":
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+class _DiscardTarget:
+    """Parser target that builds nothing, so parsing only checks syntax."""
+
+    def close(self):
+        return None
+
+
+def check_well_formed(xml_file):
+    """Parse a part without building a tree, in constant memory.
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part is not well-formed
+    """
+    parser = lxml.etree.XMLParser(target=_DiscardTarget())
+    lxml.etree.parse(str(xml_file), parser)
+
+
+def _end_handlers(checks):
+    """Map tag -> checks whose end() handles it."""
+    end_handlers = {}
+    for check in checks:
+        for tag in check.end_tags:
+            end_handlers.setdefault(tag, []).append(check)
+    return end_handlers
+
+
+def _dispatch(events, checks, failed):
+    """Dispatch (event, element) pairs to the interested checks.
+
+    A check whose start() or end() raises is recorded in failed with the
+    exception and gets no further events, while the other checks go on.
+    """
+    checks = list(checks)
+    end_handlers = _end_handlers(checks)
+    attribute_checks = [
+        (tuple(check.attributes), check) for check in checks if check.attributes
+    ]
+
+    # tag -> (checks to start, [(attribute names, check)]), built on first
+    # sight of each tag so the per-element cost is one dict lookup
+    start_handlers = {}
+
+    def handlers_for(tag):
+        local_name = tag.rpartition("}")[2].lower()
+        matched = [
+            check
+            for check in checks
+            if check.all_elements
+            or tag in check.tags
+            or local_name in check.local_names
+        ]
+        by_attribute = [
+            (names, check) for names, check in attribute_checks if check not in matched
+        ]
+        return matched, by_attribute
+
+    def fail(check, error):
+        # Each check occurs once in the handlers of an element, so the tables
+        # rebuilt here only need to be right from the next event on
+        nonlocal end_handlers, attribute_checks
+        failed[check] = error
+        checks.remove(check)
+        end_handlers = _end_handlers(checks)
+        attribute_checks = [
+            (names, other) for names, other in attribute_checks if other is not check
+        ]
+        start_handlers.clear()
+
+    for event, elem in events:
+        tag = elem.tag
+        if event == "end":
+            for check in end_handlers.get(tag, ()):
+                try:
+                    check.end(elem)
+                except Exception as e:
+                    fail(check, e)
+            continue
+
+        entry = start_handlers.get(tag)
+        if entry is None:
+            entry = start_handlers[tag] = handlers_for(tag)
+        starts, by_attribute = entry
+
+        for check in starts:
+            try:
+                check.start(elem)
+            except Exception as e:
+                fail(check, e)
+        for names, check in by_attribute:
+            for name in names:
+                if elem.get(name) is not None:
+                    try:
+                        check.start(elem)
+                    except Exception as e:
+                        fail(check, e)
+                    break
@@ -0,0 +1,693 @@
+"""
+In-process word diff, rendered like `git diff --word-diff=plain -U0`.
+
+The texts are first diffed line by line (one line per paragraph), which
+aligns unchanged paragraphs by their hash, and only the hunks that differ are
+diffed word by word. Both levels use the algorithm of git's xdiff: Myers'
+O(ND) split with git's cost heuristics, followed by its change compaction, so
+the output matches git's for the same input.
+"""
+
+import re
+
+# xdiff tuning constants (xdiff/xdiffi.c, xdiff/xprepare.c)
+_MAX_COST_MIN = 256
+_HEUR_MIN_COST = 256
+_SNAKE_CNT = 20
+_K_HEUR = 4
+_MAX_EQLIMIT = 1024
+_SIMSCAN_WINDOW = 100
+_KPDIS_RUN = 4
+
+# Indent heuristic constants, used for the line-level diff
+_START_OF_FILE_PENALTY = 1
+_END_OF_FILE_PENALTY = 21
+_TOTAL_BLANK_WEIGHT = -30
+_POST_BLANK_WEIGHT = 6
+_RELATIVE_INDENT_PENALTY = -4
+_RELATIVE_INDENT_WITH_BLANK_PENALTY = 10
+_RELATIVE_OUTDENT_PENALTY = 24
+_RELATIVE_OUTDENT_WITH_BLANK_PENALTY = 17
+_RELATIVE_DEDENT_PENALTY = 23
+_RELATIVE_DEDENT_WITH_BLANK_PENALTY = 17
+_INDENT_WEIGHT = 60
+_INDENT_HEURISTIC_MAX_SLIDING = 100
+_MAX_INDENT = 200
+_MAX_BLANKS = 20
+
+# Characters git treats as whitespace
+_SPACE = " \t\n\r"
+
+_CHARACTERS = re.compile(r".")
+_WORDS = re.compile(f"[^{_SPACE}]+")
+
+
+def word_diff(original_text, modified_text, characters=True):
+    """Render the differences between two texts with [-deleted-]{+inserted+} markup.
+
+    Like `git diff --word-diff=plain -U0` with the hunk headers and blank
+    lines left out: each hunk of changed lines is shown as the modified
+    lines, with the deleted and inserted words marked inline.
+
+    Args:
+        original_text: Text before the change, one paragraph per line
+        modified_text: Text after the change
+        characters: If True, every character is a word (like
+            --word-diff-regex=.); otherwise words are runs of non-whitespace
+
+    Returns:
+        str: The rendered lines, joined with newlines (empty if the texts are equal)
+    """
+    lines1 = _split_lines(original_text)
+    lines2 = _split_lines(modified_text)
+    hunks = diff(lines1, lines2, indent_heuristic=True)
+    return render_hunks(hunks, lines1, lines2, characters)
+
+
+def render_hunks(hunks, lines1, lines2, characters=True):
+    """Render hunks of changed lines found by diff() the way word_diff does.
+
+    Args:
+        hunks: (start1, count1, start2, count2) tuples returned by diff()
+        lines1: Lines of the original text, with their newlines. Only the
+            lines inside hunks are read, so a dict of them is enough.
+        lines2: Lines of the modified text
+        characters: If True, every character is a word; otherwise words are
+            runs of non-whitespace
+
+    Returns:
+        str: The rendered lines, joined with newlines
+    """
+    word_pattern = _CHARACTERS if characters else _WORDS
+    output = []
+    for i1, chg1, i2, chg2 in hunks:
+        minus = "".join(lines1[i] for i in range(i1, i1 + chg1))
+        plus = "".join(lines2[i] for i in range(i2, i2 + chg2))
+        rendered = _render_words(minus, plus, word_pattern)
+        output.extend(line for line in rendered.split("\n") if line.strip())
+    return "\n".join(output)
+
+
+def diff(records1, records2, indent_heuristic=False, line_starts=None):
+    """Diff two sequences of hashable records the way git's xdiff does.
+
+    Args:
+        records1: Records of the first sequence
+        records2: Records of the second sequence
+        indent_heuristic: If True, use git's indent heuristic to place
+            ambiguous changes (records must then be strings)
+        line_starts: For the indent heuristic when the records stand for
+            lines (e.g. hashes of them): a pair of lists with the start of
+            each line, up to and including its first non-whitespace character
+
+    Returns:
+        list: (start1, count1, start2, count2) tuples for each change, in order
+    """
+    classes = {}
+    ha1 = [classes.setdefault(r, len(classes)) for r in records1]
+    ha2 = [classes.setdefault(r, len(classes)) for r in records2]
+
+    # Changed flags, with a False sentinel before and after each sequence
+    rchg1 = [False] * (len(ha1) + 2)
+    rchg2 = [False] * (len(ha2) + 2)
+
+    dstart, dend1, dend2 = _trim_ends(ha1, ha2)
+    reff1, reff2 = _cleanup_records(ha1, ha2, dstart, dend1, dend2, rchg1, rchg2)
+
+    _Splitter(reff1, reff2, ha1, ha2, rchg1, rchg2).run()
+
+    indents1 = indents2 = None
+    if indent_heuristic:
+        starts1, starts2 = line_starts or (records1, records2)
+        indents1 = [_get_indent(r) for r in starts1]
+        indents2 = [_get_indent(r) for r in starts2]
+    _change_compact(ha1, rchg1, rchg2, indents1)
+    _change_compact(ha2, rchg2, rchg1, indents2)
+
+    return _build_script(rchg1, rchg2, len(ha1), len(ha2))
+
+
+def _split_lines(text):
+    """Split text into lines that keep their newline, as diff records."""
+    lines = text.split("\n")
+    last = lines.pop()
+    lines = [line + "\n" for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def _render_words(minus, plus, word_pattern):
+    """Render one hunk: the plus text with deleted and inserted words marked."""
+    out = []
+    if not plus:
+        _write(out, minus, "[-", "-]")
+        return "".join(out)
+
+    words1 = [m.span() for m in word_pattern.finditer(minus)]
+    words2 = [m.span() for m in word_pattern.finditer(plus)]
+
+    current = 0
+    for i1, chg1, i2, chg2 in diff(
+        [minus[s:e] for s, e in words1], [plus[s:e] for s, e in words2]
+    ):
+        if chg1:
+            minus_begin, minus_end = words1[i1][0], words1[i1 + chg1 - 1][1]
+        else:
+            minus_begin = minus_end = words1[i1 - 1][1] if i1 else 0
+        if chg2:
+            plus_begin, plus_end = words2[i2][0], words2[i2 + chg2 - 1][1]
+        else:
+            plus_begin = plus_end = words2[i2 - 1][1] if i2 else 0
+
+        if current != plus_begin:
+            _write(out, plus[current:plus_begin], "", "")
+        if minus_begin != minus_end:
+            _write(out, minus[minus_begin:minus_end], "[-", "-]")
+        if plus_begin != plus_end:
+            _write(out, plus[plus_begin:plus_end], "{+", "+}")
+        current = plus_end
+
+    if current != len(plus):
+        _write(out, plus[current:], "", "")
+    return "".join(out)
+
+
+def _write(out, text, prefix, suffix):
+    """Write text with each non-empty line wrapped in prefix and suffix."""
+    segments = text.split("\n")
+    for index, segment in enumerate(segments):
+        if index:
+            out.append("\n")
+        if segment:
+            out.append(prefix + segment + suffix)
+
+
+def _trim_ends(ha1, ha2):
+    """Find the common prefix and suffix, which take no part in the diff."""
+    limit = min(len(ha1), len(ha2))
+    start = 0
+    while start < limit and ha1[start] == ha2[start]:
+        start += 1
+    end = 0
+    while end < limit - start and ha1[-1 - end] == ha2[-1 - end]:
+        end += 1
+    return start, len(ha1) - end - 1, len(ha2) - end - 1
+
+
+def _bogosqrt(n):
+    i = 1
+    while n > 0:
+        n >>= 2
+        i <<= 1
+    return i
+
+
+def _cleanup_records(ha1, ha2, dstart, dend1, dend2, rchg1, rchg2):
+    """Mark records with no match in the other sequence as changed up front.
+
+    Records that match too often are also discarded when they sit among
+    unmatched ones. Returns the indexes of the records left to diff.
+    """
+    counts1, counts2 = {}, {}
+    for h in ha1:
+        counts1[h] = counts1.get(h, 0) + 1
+    for h in ha2:
+        counts2[h] = counts2.get(h, 0) + 1
+
+    def discards(ha, dend, other_counts):
+        mlim = min(_bogosqrt(len(ha)), _MAX_EQLIMIT)
+        dis = {}
+        for i in range(dstart, dend + 1):
+            nm = other_counts.get(ha[i], 0)
+            dis[i] = 0 if nm == 0 else 2 if nm >= mlim else 1
+        return dis
+
+    def keep(dis, dend, rchg):
+        reff = []
+        for i in range(dstart, dend + 1):
+            if dis[i] == 1 or (dis[i] == 2 and not _clean_mmatch(dis, i, dstart, dend)):
+                reff.append(i)
+            else:
+                rchg[i + 1] = True
+        return reff
+
+    dis1 = discards(ha1, dend1, counts2)
+    dis2 = discards(ha2, dend2, counts1)
+    return keep(dis1, dend1, rchg1), keep(dis2, dend2, rchg2)
+
+
+def _clean_mmatch(dis, i, s, e):
+    """Check whether multimatch record i sits in a run of unmatched records."""
+    s = max(s, i - _SIMSCAN_WINDOW)
+    e = min(e, i + _SIMSCAN_WINDOW)
+
+    rdis0, rpdis0 = 0, 1
+    r = 1
+    while i - r >= s:
+        if not dis[i - r]:
+            rdis0 += 1
+        elif dis[i - r] == 2:
+            rpdis0 += 1
+        else:
+            break
+        r += 1
+    if rdis0 == 0:
+        return False
+
+    rdis1, rpdis1 = 0, 1
+    r = 1
+    while i + r <= e:
+        if not dis[i + r]:
+            rdis1 += 1
+        elif dis[i + r] == 2:
+            rpdis1 += 1
+        else:
+            break
+        r += 1
+    if rdis1 == 0:
+        return False
+
+    rdis1 += rdis0
+    rpdis1 += rpdis0
+    return rpdis1 * _KPDIS_RUN < rpdis1 + rdis1
+
+
+class _Splitter:
+    """Myers' divide and conquer diff over the records left by cleanup."""
+
+    def __init__(self, reff1, reff2, ha1, ha2, rchg1, rchg2):
+        self.rindex1, self.rindex2 = reff1, reff2
+        self.ha1 = [ha1[i] for i in reff1]
+        self.ha2 = [ha2[i] for i in reff2]
+        self.rchg1, self.rchg2 = rchg1, rchg2
+        ndiags = len(reff1) + len(reff2) + 3
+        self.mxcost = max(_bogosqrt(ndiags), _MAX_COST_MIN)
+        # Furthest reaching position of each diagonal, forward and backward;
+        # diagonal d is at index d + offset
+        self.offset = len(reff2) + 1
+        self.kvdf = [0] * ndiags
+        self.kvdb = [0] * ndiags
+
+    def run(self):
+        # An explicit stack instead of recursion keeps deep splits in bounds
+        stack = [(0, len(self.ha1), 0, len(self.ha2), False)]
+        while stack:
+            off1, lim1, off2, lim2, need_min = stack.pop()
+            ha1, ha2 = self.ha1, self.ha2
+
+            # Shrink the box by walking through each diagonal snake
+            while off1 < lim1 and off2 < lim2 and ha1[off1] == ha2[off2]:
+                off1 += 1
+                off2 += 1
+            while off1 < lim1 and off2 < lim2 and ha1[lim1 - 1] == ha2[lim2 - 1]:
+                lim1 -= 1
+                lim2 -= 1
+
+            # If one dimension is empty, all records of the other one changed
+            if off1 == lim1:
+                for i in range(off2, lim2):
+                    self.rchg2[self.rindex2[i] + 1] = True
+            elif off2 == lim2:
+                for i in range(off1, lim1):
+                    self.rchg1[self.rindex1[i] + 1] = True
+            else:
+                i1, i2, min_lo, min_hi = self._split(off1, lim1, off2, lim2, need_min)
+                stack.append((i1, lim1, i2, lim2, min_hi))
+                stack.append((off1, i1, off2, i2, min_lo))
+
+    def _split(self, off1, lim1, off2, lim2, need_min):
+        """Find the middle snake; returns (i1, i2, min_lo, min_hi)."""
+        ha1, ha2, kvdf, kvdb = self.ha1, self.ha2, self.kvdf, self.kvdb
+        o = self.offset
+        dmin, dmax = off1 - lim2, lim1 - off2
+        fmid, bmid = off1 - off2, lim1 - lim2
+        odd = (fmid - bmid) & 1
+        fmin = fmax = fmid
+        bmin = bmax = bmid
+        line_max = lim1 + lim2 + 1
+
+        kvdf[fmid + o] = off1
+        kvdb[bmid + o] = lim1
+
+        ec = 0
+        while True:
+            ec += 1
+            got_snake = False
+
+            if fmin > dmin:
+                fmin -= 1
+                kvdf[fmin - 1 + o] = -1
+            else:
+                fmin += 1
+            if fmax < dmax:
+                fmax += 1
+                kvdf[fmax + 1 + o] = -1
+            else:
+                fmax -= 1
+
+            for d in range(fmax, fmin - 1, -2):
+                if kvdf[d - 1 + o] >= kvdf[d + 1 + o]:
+                    i1 = kvdf[d - 1 + o] + 1
+                else:
+                    i1 = kvdf[d + 1 + o]
+                prev1 = i1
+                i2 = i1 - d
+                while i1 < lim1 and i2 < lim2 and ha1[i1] == ha2[i2]:
+                    i1 += 1
+                    i2 += 1
+                if i1 - prev1 > _SNAKE_CNT:
+                    got_snake = True
+                kvdf[d + o] = i1
+                if odd and bmin <= d <= bmax and kvdb[d + o] <= i1:
+                    return i1, i2, True, True
+
+            if bmin > dmin:
+                bmin -= 1
+                kvdb[bmin - 1 + o] = line_max
+            else:
+                bmin += 1
+            if bmax < dmax:
+                bmax += 1
+                kvdb[bmax + 1 + o] = line_max
+            else:
+                bmax -= 1
+
+            for d in range(bmax, bmin - 1, -2):
+                if kvdb[d - 1 + o] < kvdb[d + 1 + o]:
+                    i1 = kvdb[d - 1 + o]
+                else:
+                    i1 = kvdb[d + 1 + o] - 1
+                prev1 = i1
+                i2 = i1 - d
+                while i1 > off1 and i2 > off2 and ha1[i1 - 1] == ha2[i2 - 1]:
+                    i1 -= 1
+                    i2 -= 1
+                if prev1 - i1 > _SNAKE_CNT:
+                    got_snake = True
+                kvdb[d + o] = i1
+                if not odd and fmin <= d <= fmax and i1 <= kvdf[d + o]:
+                    return i1, i2, True, True
+
+            if need_min:
+                continue
+
+            # Past the heuristic trigger, take a diagonal that has reached an
+            # "interesting" path (far from the corner, close to the middle)
+            if got_snake and ec > _HEUR_MIN_COST:
+                best = 0
+                for d in range(fmax, fmin - 1, -2):
+                    dd = d - fmid if d > fmid else fmid - d
+                    i1 = kvdf[d + o]
+                    i2 = i1 - d
+                    v = (i1 - off1) + (i2 - off2) - dd
+                    if (
+                        v > _K_HEUR * ec
+                        and v > best
+                        and off1 + _SNAKE_CNT <= i1 < lim1
+                        and off2 + _SNAKE_CNT <= i2 < lim2
+                        and all(
+                            ha1[i1 - k] == ha2[i2 - k] for k in range(1, _SNAKE_CNT + 1)
+                        )
+                    ):
+                        best = v
+                        split = (i1, i2)
+                if best > 0:
+                    return split[0], split[1], True, False
+
+                best = 0
+                for d in range(bmax, bmin - 1, -2):
+                    dd = d - bmid if d > bmid else bmid - d
+                    i1 = kvdb[d + o]
+                    i2 = i1 - d
+                    v = (lim1 - i1) + (lim2 - i2) - dd
+                    if (
+                        v > _K_HEUR * ec
+                        and v > best
+                        and off1 < i1 <= lim1 - _SNAKE_CNT
+                        and off2 < i2 <= lim2 - _SNAKE_CNT
+                        and all(ha1[i1 + k] == ha2[i2 + k] for k in range(_SNAKE_CNT))
+                    ):
+                        best = v
+                        split = (i1, i2)
+                if best > 0:
+                    return split[0], split[1], False, True
+
+            # Enough is enough: take the furthest reaching path
+            if ec >= self.mxcost:
+                fbest = fbest1 = -1
+                for d in range(fmax, fmin - 1, -2):
+                    i1 = min(kvdf[d + o], lim1)
+                    i2 = i1 - d
+                    if lim2 < i2:
+                        i1, i2 = lim2 + d, lim2
+                    if fbest < i1 + i2:
+                        fbest, fbest1 = i1 + i2, i1
+
+                bbest = bbest1 = line_max
+                for d in range(bmax, bmin - 1, -2):
+                    i1 = max(off1, kvdb[d + o])
+                    i2 = i1 - d
+                    if i2 < off2:
+                        i1, i2 = off2 + d, off2
+                    if i1 + i2 < bbest:
+                        bbest, bbest1 = i1 + i2, i1
+
+                if (lim1 + lim2) - bbest < fbest - (off1 + off2):
+                    return fbest1, fbest - fbest1, True, False
+                return bbest1, bbest - bbest1, False, True
+
+
+def _get_indent(record):
+    """Indentation width of a line, or -1 if it is blank."""
+    indent = 0
+    for c in record:
+        if c not in _SPACE:
+            return indent
+        if c == " ":
+            indent += 1
+        elif c == "\t":
+            indent += 8 - indent % 8
+        if indent >= _MAX_INDENT:
+            return _MAX_INDENT
+    return -1
+
+
+def _split_score(indents, split):
+    """Score a split before record split: (effective indent, penalty)."""
+    nrec = len(indents)
+    end_of_file = split >= nrec
+    indent = -1 if end_of_file else indents[split]
+
+    pre_blank, pre_indent = 0, -1
+    for i in range(split - 1, -1, -1):
+        pre_indent = indents[i]
+        if pre_indent != -1:
+            break
+        pre_blank += 1
+        if pre_blank == _MAX_BLANKS:
+            pre_indent = 0
+            break
+
+    post_blank, post_indent = 0, -1
+    for i in range(split + 1, nrec):
+        post_indent = indents[i]
+        if post_indent != -1:
+            break
+        post_blank += 1
+        if post_blank == _MAX_BLANKS:
+            post_indent = 0
+            break
+
+    penalty = 0
+    if pre_indent == -1 and pre_blank == 0:
+        penalty += _START_OF_FILE_PENALTY
+    if end_of_file:
+        penalty += _END_OF_FILE_PENALTY
+
+    post_blank = 1 + post_blank if indent == -1 else 0
+    total_blank = pre_blank + post_blank
+    penalty += _TOTAL_BLANK_WEIGHT * total_blank
+    penalty += _POST_BLANK_WEIGHT * post_blank
+
+    if indent == -1:
+        indent = post_indent
+    any_blanks = total_blank != 0
+
+    if indent == -1 or pre_indent == -1:
+        pass
+    elif indent > pre_indent:
+        penalty += (
+            _RELATIVE_INDENT_WITH_BLANK_PENALTY if any_blanks else _RELATIVE_INDENT_PENALTY
+        )
+    elif indent < pre_indent:
+        if post_indent != -1 and post_indent > indent:
+            penalty += (
+                _RELATIVE_OUTDENT_WITH_BLANK_PENALTY
+                if any_blanks
+                else _RELATIVE_OUTDENT_PENALTY
+            )
+        else:
+            penalty += (
+                _RELATIVE_DEDENT_WITH_BLANK_PENALTY
+                if any_blanks
+                else _RELATIVE_DEDENT_PENALTY
+            )
+    return indent, penalty
+
+
+def _change_compact(ha, rchg, rchgo, indents=None):
+    """Slide groups of changes to merge them and line them up, as xdiff does.
+
+    rchg and rchgo are the changed flags of this sequence and the other one
+    (offset by one for the sentinel). Groups are [start, end) ranges of
+    records, possibly empty; the n-th group of each sequence correspond.
+    """
+    nrec = len(ha)
+    nreco = len(rchgo) - 2
+
+    def next_group(flags, n, end):
+        if end == n:
+            return None
+        start = end + 1
+        end = start
+        while flags[end + 1]:
+            end += 1
+        return start, end
+
+    def previous_group(flags, start):
+        if start == 0:
+            return None
+        end = start - 1
+        start = end
+        while flags[start]:
+            start -= 1
+        return start, end
+
+    def slide_down(start, end):
+        if end < nrec and ha[start] == ha[end]:
+            rchg[start + 1] = False
+            rchg[end + 1] = True
+            start += 1
+            end += 1
+            while rchg[end + 1]:
+                end += 1
+            return start, end
+        return None
+
+    def slide_up(start, end):
+        if start > 0 and ha[start - 1] == ha[end - 1]:
+            rchg[start] = True
+            rchg[end] = False
+            start -= 1
+            end -= 1
+            while rchg[start]:
+                start -= 1
+            return start, end
+        return None
+
+    start = end = 0
+    while rchg[end + 1]:
+        end += 1
+    ostart = oend = 0
+    while rchgo[oend + 1]:
+        oend += 1
+
+    while True:
+        if end != start:
+            while True:
+                groupsize = end - start
+                end_matching_other = -1
+
+                # Shift the group backward as much as possible
+                while (moved := slide_up(start, end)) is not None:
+                    start, end = moved
+                    ostart, oend = previous_group(rchgo, ostart)
+
+                earliest_end = end
+                if oend > ostart:
+                    end_matching_other = end
+
+                # Now shift the group forward as far as possible
+                while (moved := slide_down(start, end)) is not None:
+                    start, end = moved
+                    ostart, oend = next_group(rchgo, nreco, oend)
+                    if oend > ostart:
+                        end_matching_other = end
+
+                if groupsize == end - start:
+                    break
+
+            if end == earliest_end:
+                pass
+            elif end_matching_other != -1:
+                # Line the group back up with the last group of changes in
+                # the other sequence that it can align with
+                while oend == ostart:
+                    start, end = slide_up(start, end)
+                    ostart, oend = previous_group(rchgo, ostart)
+            elif indents is not None:
+                best_shift, best_score = -1, None
+                shift = max(
+                    earliest_end,
+                    end - groupsize - 1,
+                    end - _INDENT_HEURISTIC_MAX_SLIDING,
+                )
+                for shift in range(shift, end + 1):
+                    indent1, penalty1 = _split_score(indents, shift)
+                    indent2, penalty2 = _split_score(indents, shift - groupsize)
+                    score = (indent1 + indent2, penalty1 + penalty2)
+                    if best_shift == -1 or _score_cmp(score, best_score) <= 0:
+                        best_shift, best_score = shift, score
+
+                while end > best_shift:
+                    start, end = slide_up(start, end)
+                    ostart, oend = previous_group(rchgo, ostart)
+
+        elif oend == ostart:
+            # Both groups are empty: skip the run of unchanged records, which
+            # pair up one to one, straight to the next change on either side
+            step = min(
+                _next_change(rchg, end, nrec) - end,
+                _next_change(rchgo, oend, nreco) - oend,
+            ) - 1
+            if step > 0:
+                start = end = end + step
+                ostart = oend = oend + step
+
+        group = next_group(rchg, nrec, end)
+        if group is None:
+            break
+        start, end = group
+        ostart, oend = next_group(rchgo, nreco, oend)
+
+
+def _next_change(flags, position, n):
+    """Return the first changed record after position, or n if there is none."""
+    try:
+        return flags.index(True, position + 2, n + 1) - 1
+    except ValueError:
+        return n
+
+
+def _score_cmp(score1, score2):
+    cmp_indents = (score1[0] > score2[0]) - (score1[0] < score2[0])
+    return _INDENT_WEIGHT * cmp_indents + (score1[1] - score2[1])
+
+
+def _build_script(rchg1, rchg2, n1, n2):
+    """Turn the changed flags into (start1, count1, start2, count2) changes."""
+    script = []
+    i1, i2 = n1, n2
+    while i1 >= 0 or i2 >= 0:
+        if rchg1[i1] or rchg2[i2]:
+            l1, l2 = i1, i2
+            while rchg1[i1]:
+                i1 -= 1
+            while rchg2[i2]:
+                i2 -= 1
+            script.append((i1, l1 - i1, i2, l2 - i2))
+        i1 -= 1
+        i2 -= 1
+    script.reverse()
+    return script
@@ -0,0 +1,116 @@
+import random
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from .worddiff import word_diff
+
+
+# Currently this is not run automatically in CI; run it from skills/docx with
+# python -m unittest ooxml.scripts.validation.worddiff_test
+def git_word_diff(original_text, modified_text, characters=True):
+    """Render the word diff with git, the way the redlining check used to."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_file = Path(temp_dir) / "original.txt"
+        modified_file = Path(temp_dir) / "modified.txt"
+        original_file.write_text(original_text, encoding="utf-8")
+        modified_file.write_text(modified_text, encoding="utf-8")
+        regex = ["--word-diff-regex=."] if characters else []
+        result = subprocess.run(
+            ["git", "diff", "--word-diff=plain", *regex, "-U0", "--no-index"]
+            + [str(original_file), str(modified_file)],
+            capture_output=True,
+            encoding="utf-8",
+        )
+    # Keep the content lines, without the headers and blank lines
+    lines = result.stdout.split("\n")
+    start = next((i + 1 for i, line in enumerate(lines) if line.startswith("@@")), 0)
+    return "\n".join(
+        line for line in lines[start:] if line.strip() and not line.startswith("@@")
+    )
+
+
+class TestWordDiff(unittest.TestCase):
+    def test_equal_texts(self):
+        self.assertEqual(word_diff("", ""), "")
+        self.assertEqual(word_diff("same\ntext", "same\ntext"), "")
+
+    def test_empty_texts(self):
+        self.assertEqual(word_diff("", "new text"), "{+new text+}")
+        self.assertEqual(word_diff("old text", ""), "[-old text-]")
+
+    def test_inserted_paragraph(self):
+        self.assertEqual(word_diff("first\nlast", "first\nmiddle\nlast"), "{+middle+}")
+
+    def test_deleted_paragraph(self):
+        self.assertEqual(word_diff("first\nmiddle\nlast", "first\nlast"), "[-middle-]")
+
+    def test_changed_characters(self):
+        self.assertEqual(
+            word_diff("one two three", "one too three"), "one t[-w-]{+o+}o three"
+        )
+
+    def test_non_ascii_text(self):
+        self.assertEqual(
+            word_diff("café naïve", "cafe naive"), "caf[-é-]{+e+} na[-ï-]{+i+}ve"
+        )
+        self.assertEqual(word_diff("日本語", "日本人"), "日本[-語-]{+人+}")
+
+    def test_word_mode(self):
+        self.assertEqual(
+            word_diff("one two three", "one too three", characters=False),
+            "one [-two-]{+too+} three",
+        )
+        self.assertEqual(
+            word_diff("keep these words", "keep those words\nand more", False),
+            "keep [-these-]{+those+} words\n{+and more+}",
+        )
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestWordDiffMatchesGit(unittest.TestCase):
+    """Compares word_diff with git on random edits of random paragraphs."""
+
+    ALPHABET = "ab cé"
+
+    def random_paragraph(self, rng):
+        return "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(1, 12)))
+
+    def random_case(self, rng):
+        original = [self.random_paragraph(rng) for _ in range(rng.randint(0, 8))]
+        modified = list(original)
+        for _ in range(rng.randint(1, 4)):
+            op = rng.random()
+            if op < 0.3 and modified:
+                i = rng.randrange(len(modified))
+                j = rng.randint(0, len(modified[i]))
+                inserted = self.random_paragraph(rng)[: rng.randint(0, 3)]
+                end = j + rng.randint(0, 3)
+                modified[i] = modified[i][:j] + inserted + modified[i][end:] or "x"
+            elif op < 0.5 and modified:
+                del modified[rng.randrange(len(modified))]
+            elif op < 0.8:
+                position = rng.randint(0, len(modified))
+                modified.insert(position, self.random_paragraph(rng))
+            else:
+                rng.shuffle(modified)
+        return "\n".join(original), "\n".join(modified)
+
+    def test_random_edits(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            original, modified = self.random_case(rng)
+            for characters in (True, False):
+                with self.subTest(
+                    original=original, modified=modified, characters=characters
+                ):
+                    self.assertEqual(
+                        word_diff(original, modified, characters),
+                        git_word_diff(original, modified, characters),
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
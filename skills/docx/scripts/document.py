@@ -8,6 +8,8 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/unpacked', engine="lxml")  # lxml-backed editors
+    doc = Document.open_docx('document.docx')  # Work on a .docx without unpacking
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -15,7 +17,9 @@ Usage:
 
     # Add comments
     doc.add_comment(start=node, end=node, text="Comment text")
+    doc.add_comments([(node, node, "First"), (other, other, "Second")])
     doc.reply_to_comment(parent_comment_id=0, text="Reply text")
+    doc.existing_comments[0]["replies"]  # IDs of the replies to comment 0
 
     # Suggest tracked changes
     doc["word/document.xml"].suggest_deletion(node)  # Delete content
@@ -24,17 +28,22 @@ Usage:
 
     # Save
     doc.save()
+    doc.save_docx('reviewed.docx')  # Write a .docx in one pass
 """
 
 import html
+import os
 import random
 import shutil
 import tempfile
+import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.pack import copy_raw_member, move_into_place, pack_document
+from ooxml.scripts.unpack import pretty_print_xml
+from ooxml.scripts.validation.cache import OriginalPackage, ParsedTreeCache
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
@@ -57,7 +66,12 @@ class DocxXMLEditor(XMLEditor):
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "GLM", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "GLM",
+        initials: str = "C",
+        engine: str = "minidom",
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,52 +80,34 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "GLM")
             initials: Author initials (default: "C")
+            engine: XML engine, "minidom" or "lxml" (default: "minidom")
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, engine=engine)
         self.rsid = rsid
         self.author = author
         self.initials = initials
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Allocate the next unused change ID of the tracked change elements."""
+        return self._allocate_id(("w:ins", "w:del"), "w:id")
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16du"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16du",
-                "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
-            )
+        self._ensure_namespace(
+            "w16du", "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+        )
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16cex",
-                "http://schemas.microsoft.com/office/word/2018/wordml/cex",
-            )
+        self._ensure_namespace(
+            "w16cex", "http://schemas.microsoft.com/office/word/2018/wordml/cex"
+        )
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w14"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w14",
-                "http://schemas.microsoft.com/office/word/2010/wordml",
-            )
+        self._ensure_namespace(
+            "w14", "http://schemas.microsoft.com/office/word/2010/wordml"
+        )
 
     def _inject_attributes_to_nodes(self, nodes):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
@@ -124,11 +120,12 @@ class DocxXMLEditor(XMLEditor):
         - w:comment: gets w:author, w:date, w:initials
         - w16cex:commentExtensible: gets w16cex:dateUtc
 
+        Each node's subtree is walked once, in document order, and all nodes
+        share one timestamp.
+
         Args:
             nodes: List of DOM nodes to process
         """
-        from datetime import datetime, timezone
-
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         def is_inside_deletion(elem):
@@ -155,9 +152,9 @@ class DocxXMLEditor(XMLEditor):
                 self._ensure_w14_namespace()
                 elem.setAttribute("w14:textId", _generate_hex_id())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, inside_deletion):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
+            if inside_deletion:
                 if not elem.hasAttribute("w:rsidDel"):
                     elem.setAttribute("w:rsidDel", self.rsid)
             else:
@@ -204,62 +201,40 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
+
         for node in nodes:
             if node.nodeType != node.ELEMENT_NODE:
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
-
-    def replace_node(self, elem, new_content):
-        """Replace node with automatic attribute injection."""
-        nodes = super().replace_node(elem, new_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_after(self, elem, xml_content):
-        """Insert after with automatic attribute injection."""
-        nodes = super().insert_after(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_before(self, elem, xml_content):
-        """Insert before with automatic attribute injection."""
-        nodes = super().insert_before(elem, xml_content)
+            # Walk the subtree in document order, keeping the open ancestors
+            # on a stack with the number of them that are w:del
+            outer_deletion = is_inside_deletion(node)
+            stack = []
+            deletions = 0
+            for elem in [node, *node.getElementsByTagName("*")]:
+                while stack and stack[-1] is not elem.parentNode:
+                    if stack.pop().tagName == "w:del":
+                        deletions -= 1
+                tag = elem.tagName
+                if tag == "w:r":
+                    add_rsid_to_r(elem, outer_deletion or deletions > 0)
+                elif tag in handlers:
+                    handlers[tag](elem)
+                stack.append(elem)
+                if tag == "w:del":
+                    deletions += 1
+
+    def _prepare_inserted(self, nodes):
+        """Inject RSID, author and date attributes before the nodes are indexed."""
         self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def append_to(self, elem, xml_content):
-        """Append to with automatic attribute injection."""
-        nodes = super().append_to(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
 
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
@@ -306,7 +281,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
 
             # Process each run
             for run in runs:
@@ -318,7 +293,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
                 for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
+                    del_text = self._dom.createElement("w:delText")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while t_elem.firstChild:
                         del_text.appendChild(t_elem.firstChild)
@@ -336,6 +311,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.reindex(ins_elem)
 
         return [elem]
 
@@ -391,7 +367,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = self._dom.createElement("w:ins")
 
             for run in runs:
                 # Clone the run
@@ -399,7 +375,7 @@ class DocxXMLEditor(XMLEditor):
 
                 # Convert w:delText → w:t
                 for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
+                    t_elem = self._dom.createElement("w:t")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while del_text.firstChild:
                         t_elem.appendChild(del_text.firstChild)
@@ -502,7 +478,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Convert w:t → w:delText
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -520,7 +496,7 @@ class DocxXMLEditor(XMLEditor):
                 elem.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             parent = elem.parentNode
             parent.insertBefore(del_wrapper, elem)
             parent.removeChild(elem)
@@ -528,6 +504,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.reindex(del_wrapper)
 
             return del_wrapper
 
@@ -546,20 +523,20 @@ class DocxXMLEditor(XMLEditor):
                 rPr_list = pPr.getElementsByTagName("w:rPr")
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
+                    rPr = self._dom.createElement("w:rPr")
                     pPr.appendChild(rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
+                del_marker = self._dom.createElement("w:del")
                 rPr.insertBefore(
                     del_marker, rPr.firstChild
                 ) if rPr.firstChild else rPr.appendChild(del_marker)
 
             # Convert w:t → w:delText in all runs
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -578,7 +555,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
                 elem.removeChild(child)
                 del_wrapper.appendChild(child)
@@ -586,6 +563,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.reindex(elem)
 
             return elem
 
@@ -604,6 +582,78 @@ def _generate_hex_id() -> str:
     return f"{random.randint(1, 0x7FFFFFFE):08X}"
 
 
+def _elements(nodes):
+    """Return the element nodes of a list of nodes."""
+    return [node for node in nodes if node.nodeType == node.ELEMENT_NODE]
+
+
+def _is_attached(node, dom):
+    """Check whether node is still part of dom."""
+    while node is not None:
+        if node is dom:
+            return True
+        node = node.parentNode
+    return False
+
+
+def _link_or_copy(source, destination):
+    """Hard-link source to destination, or copy it where links are not possible."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _pretty_print_if_stored(path):
+    """Pretty-print a part that unpack.py --lazy left as stored.
+
+    Stored parts have everything after the XML declaration on one line, which
+    leaves get_node(line_number=...) nothing to go by.
+    """
+    with open(path, "rb") as f:
+        head = f.read(1 << 16)
+    if head.count(b"\n") <= 1:
+        pretty_print_xml(path)
+
+
+def _copy_changed_files(source_dir, target_dir):
+    """Copy the files of source_dir into target_dir, skipping unchanged ones.
+
+    A file is unchanged if the target is the same file or, as with rsync, has
+    the same size and modification time. Files are replaced rather than
+    rewritten, so hard links to the old target files keep their content.
+
+    Returns:
+        int: Number of bytes copied
+    """
+    copied = 0
+    for source in source_dir.rglob("*"):
+        if not source.is_file():
+            continue
+        target = target_dir / source.relative_to(source_dir)
+        if target.exists():
+            if os.path.samefile(source, target):
+                continue
+            source_stat, target_stat = source.stat(), target.stat()
+            if (
+                source_stat.st_size == target_stat.st_size
+                and source_stat.st_mtime_ns == target_stat.st_mtime_ns
+            ):
+                continue
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copy2(source, temp_name)
+            os.replace(temp_name, target)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        copied += source.stat().st_size
+    return copied
+
+
 def _generate_rsid() -> str:
     """Generate random 8-character hex RSID."""
     return "".join(random.choices("0123456789ABCDEF", k=8))
@@ -619,31 +669,83 @@ class Document:
         track_revisions=False,
         author="GLM",
         initials="C",
+        engine="minidom",
+        link_files=False,
     ):
         """
         Initialize with path to unpacked Word document directory.
         Automatically sets up comment infrastructure (people.xml, RSIDs).
 
+        The session works on a copy of unpacked_dir at doc.unpacked_path. With
+        link_files=True its files start out as hard links to the originals
+        instead (copies where linking is not possible), so opening a session
+        does not copy the media. The editors replace files instead of rewriting
+        them, which leaves linked originals untouched, but code that writes into
+        doc.unpacked_path directly must then do the same: write a new file, or
+        delete an existing one before writing it again.
+
         Args:
-            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
+            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory),
+                or to a .docx file (see open_docx)
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "GLM")
             initials: Default author initials for comments (default: "C")
+            engine: XML engine for all editors: "minidom" (default) or "lxml",
+                which parses and saves large documents much faster in less memory
+            link_files: If True, hard-link the files of unpacked_dir instead of
+                copying them; see above (default: False)
         """
         self.original_path = Path(unpacked_dir)
+        self.engine = engine
 
-        if not self.original_path.exists() or not self.original_path.is_dir():
+        if not self.original_path.exists():
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
-
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        self._original_docx = Path(self.temp_dir) / "original.docx"
+
+        if self.original_path.is_dir():
+            # Create subdirectories for unpacked content and baseline. The
+            # baseline keeps the original files (hard links survive the original
+            # directory being updated by save) and is only packed into a .docx
+            # when validation needs it (see original_docx)
+            self._package = None
+            self._baseline_path = Path(self.temp_dir) / "baseline"
+            copy_function = _link_or_copy if link_files else shutil.copy2
+            shutil.copytree(
+                self.original_path, self._baseline_path, copy_function=copy_function
+            )
+            shutil.copytree(
+                self._baseline_path, self.unpacked_path, copy_function=copy_function
+            )
+        else:
+            # The .docx itself is the baseline. Its members are extracted into
+            # the session when first used (see _has_part), and the ones that are
+            # never changed are copied raw by save_docx
+            self._baseline_path = None
+            (_link_or_copy if link_files else shutil.copy2)(
+                self.original_path, self._original_docx
+            )
+            try:
+                self._package = zipfile.ZipFile(self._original_docx)
+            except zipfile.BadZipFile:
+                shutil.rmtree(self.temp_dir)
+                raise ValueError(f"Not a .docx file: {unpacked_dir}")
+            self._package_members = {
+                info.filename: info
+                for info in self._package.infolist()
+                if not info.is_dir()
+            }
+            for name in self._package_members:
+                if name.startswith("/") or ".." in name.split("/"):
+                    self._package.close()
+                    shutil.rmtree(self.temp_dir)
+                    raise ValueError(f"Unsafe member name in {unpacked_dir}: {name}")
+            # member name -> (size, mtime_ns) of the file as extracted
+            self._extracted = {}
+            self.unpacked_path.mkdir()
 
         self.word_path = self.unpacked_path / "word"
 
@@ -664,7 +766,12 @@ class Document:
         self.comments_ids_path = self.word_path / "commentsIds.xml"
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
-        # Load existing comments and determine next ID (before setup modifies files)
+        # Load existing comments and determine next ID (before setup modifies files).
+        # existing_comments maps each comment ID to a dict with its "para_id",
+        # "durable_id", "parent_id", "replies" (IDs of the direct replies),
+        # "range_start", "range_end" and "reference" (its w:commentRangeStart,
+        # w:commentRangeEnd and w:commentReference in document.xml, or None)
+        # and "done" (whether it is resolved)
         self.existing_comments = self._load_existing_comments()
         self.next_comment_id = self._get_next_comment_id()
 
@@ -677,6 +784,36 @@ class Document:
         # Add author to people.xml
         self._add_author_to_people(author)
 
+    @classmethod
+    def open_docx(cls, docx_path, **kwargs) -> "Document":
+        """
+        Open a session directly on a .docx file, without unpacking it first.
+
+        Parts are read from the zip when they are first used, as stored (not
+        pretty-printed, so line numbers are of little use for finding nodes).
+        The package's other files, such as media, are only extracted when
+        validation needs them. save_docx() writes the result back in one pass.
+
+        Args:
+            docx_path: Path to the .docx file
+            **kwargs: Any other Document arguments (author, engine, ...)
+
+        Returns:
+            Document for the file
+
+        Raises:
+            ValueError: If docx_path is not a .docx file
+
+        Example:
+            doc = Document.open_docx("contract.docx", author="John Doe")
+            doc.add_comment(start=node, end=node, text="Check this")
+            doc.save_docx("contract_reviewed.docx")
+        """
+        docx_path = Path(docx_path)
+        if not docx_path.is_file():
+            raise ValueError(f"Not a .docx file: {docx_path}")
+        return cls(docx_path, **kwargs)
+
     def __getitem__(self, xml_path: str) -> DocxXMLEditor:
         """
         Get or create a DocxXMLEditor for the specified XML file.
@@ -702,11 +839,18 @@ class Document:
         """
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
-            if not file_path.exists():
+            if not self._has_part(file_path):
                 raise ValueError(f"XML file not found: {xml_path}")
+            if self._package is None:
+                # open_docx sessions keep their parts as stored
+                _pretty_print_if_stored(file_path)
             # Use DocxXMLEditor with RSID, author, and initials for all editors
             self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                engine=self.engine,
             )
         return self._editors[xml_path]
 
@@ -727,40 +871,85 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
+        return self.add_comments([(start, end, text)])[0]
+
+    def add_comments(self, comments) -> list:
+        """
+        Add several comments in one batch.
+
+        Does the same as calling add_comment for each comment, but allocates
+        the IDs up front and adds the markup of all comments to each of the
+        five parts in one insertion, so the time per comment stays the same
+        for hundreds of comments. The comments share one timestamp.
+
+        Args:
+            comments: List of (start, end, text) triples, as taken by add_comment
+
+        Returns:
+            List[int]: The comment IDs that were created, in the order of comments
+
+        Example:
+            editor = doc["word/document.xml"]
+            editor.build_text_index("w:p")
+            paras = [editor.get_node(tag="w:p", contains=p) for p in phrases]
+            doc.add_comments([(para, para, "Needs a citation") for para in paras])
+        """
+        if not comments:
+            return []
+        first_id = self._get_next_comment_id()
+        comment_ids = list(range(first_id, first_id + len(comments)))
+        para_ids = [_generate_hex_id() for _ in comments]
+        durable_ids = [_generate_hex_id() for _ in comments]
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
-
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+        edits = []
+        for comment_id, (start, end, _) in zip(comment_ids, comments):
+            edits.append(("before", start, self._comment_range_start_xml(comment_id)))
+            # If end node is a paragraph, append comment markup inside it
+            # Otherwise insert after it (for run-level anchors)
+            where = "append" if end.tagName == "w:p" else "after"
+            edits.append((where, end, self._comment_range_end_xml(comment_id)))
+        fragments = self._document.insert_nodes(edits)
 
         # Add to comments.xml immediately
         self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
+            [
+                (comment_id, para_id, text)
+                for comment_id, para_id, (_, _, text) in zip(
+                    comment_ids, para_ids, comments
+                )
+            ],
+            self.author,
+            self.initials,
+            timestamp,
         )
 
         # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
+        self._add_to_comments_extended_xml([(para_id, None) for para_id in para_ids])
 
         # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        self._add_to_comments_ids_xml(list(zip(para_ids, durable_ids)))
 
         # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        self._add_to_comments_extensible_xml(durable_ids)
 
         # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        for i, comment_id in enumerate(comment_ids):
+            range_start = fragments[2 * i][0]
+            range_end, reference_run = _elements(fragments[2 * i + 1])
+            self._index_comment(
+                comment_id,
+                para_ids[i],
+                durable_ids[i],
+                parent_id=None,
+                range_start=range_start,
+                range_end=range_end,
+                reference=reference_run.getElementsByTagName("w:commentReference")[0],
+            )
 
-        self.next_comment_id += 1
-        return comment_id
+        self.next_comment_id = comment_ids[-1] + 1
+        return comment_ids
 
     def reply_to_comment(
         self,
@@ -784,54 +973,77 @@ class Document:
             raise ValueError(f"Parent comment with id={parent_comment_id} not found")
 
         parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
+        comment_id = self._get_next_comment_id()
         para_id = _generate_hex_id()
         durable_id = _generate_hex_id()
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
-            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
+        parent_start_elem = self._comment_node(
+            parent_comment_id, "range_start", "w:commentRangeStart"
         )
-        parent_ref_elem = self._document.get_node(
-            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
+        parent_ref_elem = self._comment_node(
+            parent_comment_id, "reference", "w:commentReference"
         )
 
-        self._document.insert_after(
-            parent_start_elem, self._comment_range_start_xml(comment_id)
-        )
         parent_ref_run = parent_ref_elem.parentNode
-        self._document.insert_after(
-            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
-        )
-        self._document.insert_after(
-            parent_ref_run, self._comment_ref_run_xml(comment_id)
+        range_start, range_end, reference_run = self._document.insert_nodes(
+            [
+                (
+                    "after",
+                    parent_start_elem,
+                    self._comment_range_start_xml(comment_id),
+                ),
+                ("after", parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'),
+                ("after", parent_ref_run, self._comment_ref_run_xml(comment_id)),
+            ]
         )
 
         # Add to comments.xml immediately
         self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
+            [(comment_id, para_id, text)], self.author, self.initials, timestamp
         )
 
         # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
+        self._add_to_comments_extended_xml([(para_id, parent_info["para_id"])])
 
         # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        self._add_to_comments_ids_xml([(para_id, durable_id)])
 
         # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        self._add_to_comments_extensible_xml([durable_id])
 
         # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        self._index_comment(
+            comment_id,
+            para_id,
+            durable_id,
+            parent_id=parent_comment_id,
+            range_start=_elements(range_start)[0],
+            range_end=_elements(range_end)[0],
+            reference=_elements(reference_run)[0].getElementsByTagName(
+                "w:commentReference"
+            )[0],
+        )
 
-        self.next_comment_id += 1
+        self.next_comment_id = comment_id + 1
         return comment_id
 
+    @property
+    def original_docx(self) -> Path:
+        """The original document packed as .docx, the baseline for validation.
+
+        Packed on first use from the files as they were when the session began
+        (for sessions opened on a .docx, the file itself).
+        """
+        if not self._original_docx.exists():
+            pack_document(self._baseline_path, self._original_docx, validate=False)
+        return self._original_docx
+
     def __del__(self):
         """Clean up temporary directory on deletion."""
+        if getattr(self, "_package", None) is not None:
+            self._package.close()
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
@@ -842,74 +1054,218 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
-        schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-        redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
+        # The validators check references to media and other files too
+        self._extract_all()
+
+        # Both validators share one view of the original (baseline) docx and
+        # the parsed trees of the unpacked parts
+        tree_cache = ParsedTreeCache()
+        with OriginalPackage(self.original_docx) as original_package:
+            # Create validators with current state
+            # Manifests in the session temp dir let repeated saves skip parts
+            # that are unchanged since the last passing validation
+            schema_validator = DOCXSchemaValidator(
+                self.unpacked_path,
+                self.original_docx,
+                verbose=False,
+                original_package=original_package,
+                manifest_path=Path(self.temp_dir) / "schema_manifest.json",
+                tree_cache=tree_cache,
+            )
+            redlining_validator = RedliningValidator(
+                self.unpacked_path,
+                self.original_docx,
+                verbose=False,
+                original_package=original_package,
+                manifest_path=Path(self.temp_dir) / "redlining_manifest.json",
+                tree_cache=tree_cache,
+            )
 
-        # Run validations
-        if not schema_validator.validate():
-            raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
-            raise ValueError("Redlining validation failed")
+            # Run validations
+            if not schema_validator.validate():
+                raise ValueError("Schema validation failed")
+            if not redlining_validator.validate():
+                raise ValueError("Redlining validation failed")
 
-    def save(self, destination=None, validate=True) -> None:
+    def save(self, destination=None, validate=True) -> int:
         """
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Parts are only written if their content changed, including through
+        direct DOM edits (see XMLEditor.save_if_changed), and only files that
+        differ from the destination's are copied, so saving an unchanged
+        document again writes nothing.
+
+        For sessions opened on a .docx, saving without a destination writes
+        the .docx back (see save_docx), and a destination is a directory that
+        receives the unpacked files.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
+
+        Returns:
+            int: Number of bytes written to the destination
         """
+        self._save_editors(validate)
+
+        if self._package is not None:
+            if destination is None:
+                return self._write_docx(self.original_path)
+            self._extract_all()
+
+        # Copy changed files from temp directory to destination (or original directory)
+        target_path = Path(destination) if destination else self.original_path
+        return _copy_changed_files(self.unpacked_path, target_path)
+
+    def save_docx(self, destination=None, validate=True) -> int:
+        """
+        Save the document as a .docx file, written in a single pass.
+
+        For sessions opened on a .docx, members that were not changed are
+        copied from the original zip as they are, without recompressing them,
+        so they stay byte-identical. Other sessions are packed with
+        pack_document, against the packed baseline if validation built it.
+
+        Args:
+            destination: Path of the .docx to write. If None, overwrites the
+                .docx the session was opened on.
+            validate: If True, validates document before saving (default: True).
+
+        Returns:
+            int: Size in bytes of the written .docx
+
+        Raises:
+            ValueError: If validation fails, or destination is None for a
+                session opened on a directory
+        """
+        if destination is None and self._package is None:
+            raise ValueError("destination is required when not opened on a .docx")
+
+        self._save_editors(validate)
+
+        if self._package is None:
+            destination = Path(destination)
+            reference = self._original_docx if self._original_docx.exists() else None
+            pack_document(
+                self.unpacked_path, destination, validate=False, reference=reference
+            )
+            return destination.stat().st_size
+        return self._write_docx(Path(destination or self.original_path))
+
+    # ==================== Private: Saving ====================
+
+    def _save_editors(self, validate):
+        """Finish comment infrastructure, save modified XML files and validate."""
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if self._has_part(self.comments_path):
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
         # Save all modified XML files in temp directory
         for editor in self._editors.values():
-            editor.save()
+            editor.save_if_changed()
 
         # Validate by default
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
-        target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+    def _write_docx(self, destination):
+        """Write the session of a .docx to destination in one pass.
+
+        Members are written in their original order; the ones whose file was
+        never extracted, or is unchanged since, are copied raw. Files new to
+        the session are added at the end.
+
+        Returns:
+            int: Size in bytes of the written .docx
+        """
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=destination.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(temp_name, "w", zipfile.ZIP_DEFLATED) as zf:
+                for name, info in self._package_members.items():
+                    path = self.unpacked_path / name
+                    if not path.is_file():
+                        # Removed during the session
+                        if name in self._extracted:
+                            continue
+                        copy_raw_member(self._package, info, zf)
+                        continue
+                    stat = path.stat()
+                    if self._extracted.get(name) == (stat.st_size, stat.st_mtime_ns):
+                        copy_raw_member(self._package, info, zf)
+                    else:
+                        zf.write(path, name)
+
+                for path in sorted(self.unpacked_path.rglob("*")):
+                    name = path.relative_to(self.unpacked_path).as_posix()
+                    if path.is_file() and name not in self._package_members:
+                        zf.write(path, name)
+            move_into_place(temp_name, destination)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return destination.stat().st_size
+
+    # ==================== Private: Package Parts ====================
+
+    def _has_part(self, path):
+        """Check whether a file exists in the session, extracting it if needed."""
+        if self._package is not None:
+            name = path.relative_to(self.unpacked_path).as_posix()
+            if name in self._package_members and name not in self._extracted:
+                self._extract(name)
+        return path.exists()
+
+    def _extract(self, name):
+        """Extract a member of the .docx into the session.
+
+        A file the session already created under that name is kept, and is
+        written to the .docx in place of the member.
+        """
+        path = self.unpacked_path / name
+        if path.exists():
+            self._extracted[name] = None
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._package.open(name) as source, open(path, "wb") as target:
+            shutil.copyfileobj(source, target)
+        stat = path.stat()
+        self._extracted[name] = (stat.st_size, stat.st_mtime_ns)
+
+    def _extract_all(self):
+        """Extract the members of the .docx not yet in the session."""
+        if self._package is None:
+            return
+        for name in self._package_members:
+            if name not in self._extracted:
+                self._extract(name)
 
     # ==================== Private: Initialization ====================
 
     def _get_next_comment_id(self):
         """Get the next available comment ID."""
-        if not self.comments_path.exists():
+        if not self._has_part(self.comments_path):
             return 0
 
-        editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+        return self["word/comments.xml"].get_next_id(("w:comment",), "w:id")
 
     def _load_existing_comments(self):
-        """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        """Load existing comments from files to enable replies.
+
+        Builds the comment index (see existing_comments) in one pass over each
+        of comments.xml, commentsExtended.xml, commentsIds.xml and document.xml.
+        """
+        if not self._has_part(self.comments_path):
             return {}
 
         editor = self["word/comments.xml"]
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor._dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if not comment_id:
                 continue
@@ -924,10 +1280,100 @@ class Document:
             if not para_id:
                 continue
 
-            existing[int(comment_id)] = {"para_id": para_id}
+            existing[int(comment_id)] = {
+                "para_id": para_id,
+                "durable_id": None,
+                "parent_id": None,
+                "replies": [],
+                "range_start": None,
+                "range_end": None,
+                "reference": None,
+                "done": False,
+            }
+        if not existing:
+            return existing
+
+        by_para_id = {
+            info["para_id"]: comment_id for comment_id, info in existing.items()
+        }
+
+        # Threads and resolved state
+        if self._has_part(self.comments_extended_path):
+            editor = self["word/commentsExtended.xml"]
+            for ex_elem in editor._dom.getElementsByTagName("w15:commentEx"):
+                comment_id = by_para_id.get(ex_elem.getAttribute("w15:paraId"))
+                if comment_id is None:
+                    continue
+                info = existing[comment_id]
+                info["done"] = ex_elem.getAttribute("w15:done") == "1"
+                parent_id = by_para_id.get(ex_elem.getAttribute("w15:paraIdParent"))
+                if parent_id is not None and parent_id != comment_id:
+                    info["parent_id"] = parent_id
+                    existing[parent_id]["replies"].append(comment_id)
+
+        # Durable IDs
+        if self._has_part(self.comments_ids_path):
+            editor = self["word/commentsIds.xml"]
+            for ids_elem in editor._dom.getElementsByTagName("w16cid:commentId"):
+                comment_id = by_para_id.get(ids_elem.getAttribute("w16cid:paraId"))
+                if comment_id is not None:
+                    durable_id = ids_elem.getAttribute("w16cid:durableId")
+                    existing[comment_id]["durable_id"] = durable_id
+
+        # Comment ranges and references in the document
+        keys = {
+            "w:commentRangeStart": "range_start",
+            "w:commentRangeEnd": "range_end",
+            "w:commentReference": "reference",
+        }
+        for elem in self["word/document.xml"]._dom.getElementsByTagName("*"):
+            key = keys.get(elem.tagName)
+            if key is None:
+                continue
+            comment_id = elem.getAttribute("w:id")
+            info = existing.get(int(comment_id)) if comment_id.isdigit() else None
+            if info is not None and info[key] is None:
+                info[key] = elem
 
         return existing
 
+    def _index_comment(
+        self,
+        comment_id,
+        para_id,
+        durable_id,
+        parent_id,
+        range_start,
+        range_end,
+        reference,
+    ):
+        """Add a comment just created to existing_comments."""
+        self.existing_comments[comment_id] = {
+            "para_id": para_id,
+            "durable_id": durable_id,
+            "parent_id": parent_id,
+            "replies": [],
+            "range_start": range_start,
+            "range_end": range_end,
+            "reference": reference,
+            "done": False,
+        }
+        if parent_id is not None:
+            self.existing_comments[parent_id]["replies"].append(comment_id)
+
+    def _comment_node(self, comment_id, key, tag):
+        """Return a node of a comment in document.xml from existing_comments.
+
+        The node is looked up with get_node if the index has none or it has
+        been removed from the document since.
+        """
+        info = self.existing_comments[comment_id]
+        node = info[key]
+        if node is None or not _is_attached(node, self._document._dom):
+            node = self._document._find_node(tag=tag, attrs={"w:id": str(comment_id)})
+            info[key] = node
+        return node
+
     # ==================== Private: Setup Methods ====================
 
     def _setup_tracking(self, track_revisions=False):
@@ -953,7 +1399,7 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
+        if not self._has_part(path):
             # Copy from template
             shutil.copy(TEMPLATE_DIR / "people.xml", path)
 
@@ -965,7 +1411,7 @@ class Document:
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
@@ -976,7 +1422,7 @@ class Document:
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
@@ -999,14 +1445,14 @@ class Document:
         - rsids: late (after compat)
         """
         editor = self["word/settings.xml"]
-        root = editor.get_node(tag="w:settings")
+        root = editor._find_node(tag="w:settings")
         prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
 
         # Conditionally add trackRevisions if requested
         if track_revisions:
             track_revisions_exists = any(
                 elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
+                for elem in editor._dom.getElementsByTagName(f"{prefix}:trackRevisions")
             )
 
             if not track_revisions_exists:
@@ -1014,7 +1460,7 @@ class Document:
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor._dom.getElementsByTagName(tag)
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
@@ -1030,7 +1476,7 @@ class Document:
         if update_fields:
             update_fields_exists = any(
                 elem.tagName == f"{prefix}:updateFields"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:updateFields")
+                for elem in editor._dom.getElementsByTagName(f"{prefix}:updateFields")
             )
 
             if not update_fields_exists:
@@ -1038,7 +1484,7 @@ class Document:
                 # Try to insert before defaultTabStop, hyphenationZone, or at start
                 inserted = False
                 for tag in [f"{prefix}:defaultTabStop", f"{prefix}:hyphenationZone"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor._dom.getElementsByTagName(tag)
                     if elements:
                         editor.insert_before(elements[0], update_fields_xml)
                         inserted = True
@@ -1051,7 +1497,7 @@ class Document:
                         editor.append_to(root, update_fields_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor._dom.getElementsByTagName(f"{prefix}:rsids")
 
         if not rsids_elements:
             # Add new rsids section
@@ -1062,13 +1508,13 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor._dom.getElementsByTagName(f"{prefix}:compat")
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
+                clr_elements = editor._dom.getElementsByTagName(
                     f"{prefix}:clrSchemeMapping"
                 )
                 if clr_elements:
@@ -1091,68 +1537,71 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+    def _add_to_comments_xml(self, comments, author, initials, timestamp):
+        """Add comments, as (comment_id, para_id, text), to comments.xml."""
+        editor, root = self._comment_part("word/comments.xml")
 
-        editor = self["word/comments.xml"]
-        root = editor.get_node(tag="w:comments")
-
-        escaped_text = (
-            text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        )
-        # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
-        # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
+        comment_xmls = []
+        for comment_id, para_id, text in comments:
+            escaped_text = (
+                text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            )
+            # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
+            # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
+            comment_xmls.append(f'''<w:comment w:id="{comment_id}">
   <w:p w14:paraId="{para_id}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
-</w:comment>'''
-        editor.append_to(root, comment_xml)
-
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
+</w:comment>''')
+        editor.append_to(root, "".join(comment_xmls))
+
+    def _add_to_comments_extended_xml(self, comments):
+        """Add comments, as (para_id, parent_para_id), to commentsExtended.xml."""
+        editor, root = self._comment_part("word/commentsExtended.xml")
+
+        xmls = []
+        for para_id, parent_para_id in comments:
+            if parent_para_id:
+                xmls.append(
+                    f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
+                )
+            else:
+                xmls.append(f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>')
+        editor.append_to(root, "".join(xmls))
 
-        editor = self["word/commentsExtended.xml"]
-        root = editor.get_node(tag="w15:commentsEx")
+    def _add_to_comments_ids_xml(self, comments):
+        """Add comments, as (para_id, durable_id), to commentsIds.xml."""
+        editor, root = self._comment_part("word/commentsIds.xml")
 
-        if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
+        xml = "".join(
+            f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
+            for para_id, durable_id in comments
+        )
         editor.append_to(root, xml)
 
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
+    def _add_to_comments_extensible_xml(self, durable_ids):
+        """Add comments, by durable_id, to commentsExtensible.xml."""
+        editor, root = self._comment_part("word/commentsExtensible.xml")
 
-        editor = self["word/commentsIds.xml"]
-        root = editor.get_node(tag="w16cid:commentsIds")
-
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
+        xml = "".join(
+            f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+            for durable_id in durable_ids
+        )
         editor.append_to(root, xml)
 
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
-
-        editor = self["word/commentsExtensible.xml"]
-        root = editor.get_node(tag="w16cex:commentsExtensible")
+    def _comment_part(self, xml_path):
+        """Return the editor and root element of a comment part.
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
+        The part is created from its template if it does not exist yet. The
+        root is taken from the DOM each time, which costs nothing and stays
+        right whatever the editor does to the document element.
+        """
+        file_path = self.unpacked_path / xml_path
+        if not self._has_part(file_path):
+            shutil.copy(TEMPLATE_DIR / file_path.name, file_path)
+        editor = self[xml_path]
+        return editor, editor._dom.documentElement
 
     # ==================== Private: XML Fragments ====================
 
@@ -1185,21 +1634,21 @@ class Document:
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
+        for rel_elem in editor._dom.getElementsByTagName("Relationship"):
             if rel_elem.getAttribute("Target") == target:
                 return True
         return False
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
+        for override_elem in editor._dom.getElementsByTagName("Override"):
             if override_elem.getAttribute("PartName") == part_name:
                 return True
         return False
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
+        for person_elem in editor._dom.getElementsByTagName("w15:person"):
             if person_elem.getAttribute("w15:author") == author:
                 return True
         return False
@@ -1209,11 +1658,11 @@ class Document:
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._has_part(people_path):
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
-        root = editor.get_node(tag="w15:people")
+        root = editor._find_node(tag="w15:people")
 
         # Check if author already exists
         if self._has_author(editor, author):
@@ -1233,7 +1682,7 @@ class Document:
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
@@ -1273,7 +1722,7 @@ class Document:
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
 
         # Add Override elements
         overrides = [
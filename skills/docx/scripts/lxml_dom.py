@@ -0,0 +1,634 @@
+"""
+minidom-compatible DOM on top of lxml.
+
+XMLEditor(engine="lxml") parses with this module instead of defusedxml.minidom.
+Elements are lxml elements with the subset of the minidom API that XMLEditor,
+DocxXMLEditor and scripts written against them use (tagName, getAttribute,
+setAttribute, getElementsByTagName, parentNode, firstChild, nextSibling,
+childNodes, appendChild, insertBefore, removeChild, replaceChild, cloneNode,
+toxml, ...), so the same code runs on either engine. Compared to minidom the
+tree takes a fraction of the memory, and parsing and serializing happen in C.
+
+Differences from minidom:
+    - Qualified names are resolved through the namespace declarations in scope,
+      so getElementsByTagName("w:p") matches by namespace URI, not by prefix.
+    - Text nodes are views of lxml's text and tail slots, so adjacent text
+      nodes merge into one.
+    - parse_position is (sourceline, None); lxml does not record columns.
+    - Declaring a namespace (setAttribute("xmlns:prefix", uri)) drops the
+      declarations below the element that repeat one in scope. Declaring a
+      default namespace, or rebinding a prefix in scope, raises ValueError.
+
+Like defusedxml, parsing refuses entity declarations and never loads external
+DTDs or entities.
+
+Example:
+    dom = lxml_dom.parse("word/document.xml")
+    for para in dom.getElementsByTagName("w:p"):
+        print(para.parse_position[0], para.getAttribute("w14:paraId"))
+"""
+
+import copy
+import weakref
+from xml.dom import Node, NotFoundErr
+
+import defusedxml
+import lxml.etree
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# Document element -> Document, so that the root's parentNode is the document
+_documents = weakref.WeakValueDictionary()
+
+# (owner element, is_tail) -> live Text node for that slot, so the same text is
+# the same object and stays valid when structural edits move it to another slot
+_texts = weakref.WeakValueDictionary()
+
+
+def parse(path):
+    """Parse an XML file into a Document, recording source lines."""
+    tree = lxml.etree.parse(str(path), _make_parser())
+    return Document(tree)
+
+
+def parseString(string):
+    """Parse an XML string (str or bytes) into a Document."""
+    if isinstance(string, str):
+        string = string.encode("utf-8")
+    tree = lxml.etree.ElementTree(lxml.etree.fromstring(string, _make_parser()))
+    return Document(tree)
+
+
+def _make_parser():
+    """Create a parser that does not resolve entities or load external resources."""
+    parser = lxml.etree.XMLParser(
+        resolve_entities=False,
+        no_network=True,
+        load_dtd=False,
+        huge_tree=False,
+    )
+    parser.set_element_class_lookup(
+        lxml.etree.ElementDefaultClassLookup(
+            element=Element, comment=Comment, pi=ProcessingInstruction
+        )
+    )
+    return parser
+
+
+def _check_entities(tree):
+    """Raise defusedxml.EntitiesForbidden if the document declares entities."""
+    dtd = tree.docinfo.internalDTD
+    if dtd is None:
+        return
+    for entity in dtd.iterentities():
+        raise defusedxml.EntitiesForbidden(
+            entity.name, entity.content, None, entity.system_url, None, None
+        )
+
+
+def _resolve(qname, nsmap, is_attribute=False):
+    """Convert a qualified name (e.g. "w:p") to Clark notation ("{uri}p").
+
+    Unprefixed element names take the default namespace; unprefixed attribute
+    names have no namespace. Returns None for an undeclared prefix.
+    """
+    prefix, _, local = qname.rpartition(":")
+    if not prefix:
+        uri = None if is_attribute else nsmap.get(None)
+    elif prefix == "xml":
+        uri = XML_NAMESPACE
+    else:
+        uri = nsmap.get(prefix)
+        if uri is None:
+            return None
+    return f"{{{uri}}}{local}" if uri else local
+
+
+def _own_namespaces(elem):
+    """Return the namespace declarations made on elem itself."""
+    parent = elem.getparent()
+    inherited = parent.nsmap if parent is not None else {}
+    return {
+        prefix: uri
+        for prefix, uri in elem.nsmap.items()
+        if inherited.get(prefix) != uri
+    }
+
+
+def _text(owner, is_tail):
+    """Return the Text node for the text (or tail) slot of owner."""
+    node = _texts.get((owner, is_tail))
+    if node is None:
+        node = Text(owner, is_tail)
+    return node
+
+
+def _move_text(owner, is_tail, new_owner, new_is_tail):
+    """Point the Text node of a slot whose content moved to another slot."""
+    node = _texts.get((owner, is_tail))
+    if node is not None:
+        node._attach(new_owner, new_is_tail)
+
+
+def _escape_text(data):
+    """Escape character data the way minidom does."""
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+class _NodeTypes:
+    """minidom node type constants, available on every node."""
+
+    ELEMENT_NODE = Node.ELEMENT_NODE
+    ATTRIBUTE_NODE = Node.ATTRIBUTE_NODE
+    TEXT_NODE = Node.TEXT_NODE
+    PROCESSING_INSTRUCTION_NODE = Node.PROCESSING_INSTRUCTION_NODE
+    COMMENT_NODE = Node.COMMENT_NODE
+    DOCUMENT_NODE = Node.DOCUMENT_NODE
+
+    def __bool__(self):
+        # lxml elements are falsy without children; DOM nodes are always true
+        return True
+
+
+class _TreeNode(_NodeTypes):
+    """Sibling and parent navigation shared by elements, comments and PIs."""
+
+    @property
+    def parentNode(self):
+        parent = self.getparent()
+        if parent is None:
+            return _documents.get(self)
+        return parent
+
+    @property
+    def nextSibling(self):
+        if self.tail:
+            return _text(self, True)
+        return self.getnext()
+
+    @property
+    def previousSibling(self):
+        previous = self.getprevious()
+        if previous is not None:
+            return _text(previous, True) if previous.tail else previous
+        parent = self.getparent()
+        if parent is not None and parent.text:
+            return _text(parent, False)
+        return None
+
+    @property
+    def ownerDocument(self):
+        return _documents.get(self.getroottree().getroot())
+
+    def _detach(self):
+        """Unlink this node from its parent, leaving its tail text in place."""
+        parent = self.getparent()
+        if parent is None:
+            return
+        tail, self.tail = self.tail, None
+        previous = self.getprevious()
+        parent.remove(self)
+        if tail:
+            if previous is not None:
+                previous.tail = (previous.tail or "") + tail
+                _move_text(self, True, previous, True)
+            else:
+                parent.text = (parent.text or "") + tail
+                _move_text(self, True, parent, False)
+
+
+class Element(_TreeNode, lxml.etree.ElementBase):
+    """An lxml element with the minidom Element API."""
+
+    nodeType = Node.ELEMENT_NODE
+
+    @property
+    def tagName(self):
+        local = self.tag.rpartition("}")[2]
+        return f"{self.prefix}:{local}" if self.prefix else local
+
+    nodeName = tagName
+
+    @property
+    def localName(self):
+        return self.tag.rpartition("}")[2]
+
+    @property
+    def namespaceURI(self):
+        return self.tag[1:].partition("}")[0] if self.tag[0] == "{" else None
+
+    @property
+    def parse_position(self):
+        """(line, column) in the parsed file; column is not tracked by lxml."""
+        if not self.sourceline:
+            raise AttributeError("parse_position")
+        return (self.sourceline, None)
+
+    # ---- Attributes ----
+
+    def _attribute_name(self, qname):
+        # Fast path: the attribute uses the element's own prefix (e.g. w:id
+        # on w:ins), which avoids collecting the namespaces in scope
+        prefix, _, local = qname.rpartition(":")
+        if prefix and prefix == self.prefix:
+            return f"{{{self.namespaceURI}}}{local}"
+        return _resolve(qname, self.nsmap, is_attribute=True)
+
+    def getAttribute(self, name):
+        if name == "xmlns" or name.startswith("xmlns:"):
+            return _own_namespaces(self).get(name[6:] or None, "")
+        key = self._attribute_name(name)
+        return self.get(key, "") if key else ""
+
+    def hasAttribute(self, name):
+        if name == "xmlns" or name.startswith("xmlns:"):
+            return (name[6:] or None) in _own_namespaces(self)
+        key = self._attribute_name(name)
+        return key is not None and key in self.attrib
+
+    def setAttribute(self, name, value):
+        if name == "xmlns" or name.startswith("xmlns:"):
+            self._declare_namespace(name[6:] or None, value)
+            return
+        key = self._attribute_name(name)
+        if key is None:
+            raise ValueError(f"Undeclared namespace prefix in attribute: {name}")
+        self.set(key, value)
+
+    def removeAttribute(self, name):
+        key = self._attribute_name(name)
+        if key is None or key not in self.attrib:
+            raise NotFoundErr(name)
+        del self.attrib[key]
+
+    @property
+    def attributes(self):
+        return _Attributes(self)
+
+    def _declare_namespace(self, prefix, uri):
+        """Declare a namespace on this element, keeping the element itself.
+
+        lxml has no API to add a declaration to an element, but namespace
+        cleanup can declare one on the top of a subtree in place. Cleanup also
+        drops declarations that repeat one in scope; all others are kept.
+        """
+        declared = self.nsmap.get(prefix)
+        if declared == uri:
+            return
+        if prefix is None:
+            raise ValueError("Cannot declare a default namespace on an existing element")
+        if declared is not None:
+            raise ValueError(f"Namespace prefix {prefix} is already bound to {declared}")
+        prefixes = {
+            name for elem in self.iter(lxml.etree.Element) for name in elem.nsmap
+        }
+        prefixes.add(prefix)
+        prefixes.discard(None)
+        lxml.etree.cleanup_namespaces(
+            self, top_nsmap={prefix: uri}, keep_ns_prefixes=sorted(prefixes)
+        )
+
+    # ---- Navigation ----
+
+    def getElementsByTagName(self, name):
+        return [elem for elem in self._iter_tag(name) if elem is not self]
+
+    def _iter_tag(self, name):
+        if name == "*":
+            return self.iter(lxml.etree.Element)
+        key = _resolve(name, self.nsmap)
+        return self.iter(key) if key else iter(())
+
+    @property
+    def childNodes(self):
+        nodes = [_text(self, False)] if self.text else []
+        for child in self:
+            nodes.append(child)
+            if child.tail:
+                nodes.append(_text(child, True))
+        return nodes
+
+    @property
+    def firstChild(self):
+        if self.text:
+            return _text(self, False)
+        return self[0] if len(self) else None
+
+    @property
+    def lastChild(self):
+        if not len(self):
+            return _text(self, False) if self.text else None
+        last = self[-1]
+        return _text(last, True) if last.tail else last
+
+    def hasChildNodes(self):
+        return bool(self.text) or len(self) > 0
+
+    # ---- Mutation ----
+
+    def appendChild(self, node):
+        if isinstance(node, Text):
+            node._move_to(self, None)
+        else:
+            node._detach()
+            self.append(node)
+        return node
+
+    def insertBefore(self, node, reference):
+        if reference is None:
+            return self.appendChild(node)
+        if reference.parentNode is not self:
+            raise NotFoundErr("Reference node is not a child of this element")
+        if isinstance(node, Text):
+            node._move_to(self, reference)
+            return node
+        node._detach()
+        if isinstance(reference, Text):
+            # The new node goes between the text's owner slot and the text
+            if reference.is_tail:
+                owner = reference.owner
+                node.tail, owner.tail = owner.tail, None
+                owner.addnext(node)
+            else:
+                node.tail, self.text = self.text, None
+                self.insert(0, node)
+            reference._attach(node, True)
+        else:
+            reference.addprevious(node)
+        return node
+
+    def removeChild(self, node):
+        if node.parentNode is not self:
+            raise NotFoundErr("Node is not a child of this element")
+        node._detach()
+        return node
+
+    def replaceChild(self, node, old):
+        self.insertBefore(node, old)
+        return self.removeChild(old)
+
+    def cloneNode(self, deep=False):
+        if deep:
+            clone = copy.deepcopy(self)
+            clone.tail = None
+        else:
+            clone = self.makeelement(self.tag, dict(self.attrib), nsmap=self.nsmap)
+        for elem in clone.iter():
+            elem.sourceline = 0
+        return clone
+
+    # ---- Serialization ----
+
+    def toxml(self, encoding=None):
+        """Serialize without the namespace declarations inherited from ancestors."""
+        holder = self.makeelement("holder", nsmap=self.nsmap)
+        holder.append(self.cloneNode(deep=True))
+        xml = lxml.etree.tostring(holder, encoding="unicode")
+        xml = xml[xml.index(">") + 1 : xml.rindex("<")]
+        return xml.encode(encoding) if encoding else xml
+
+
+class Comment(_TreeNode, lxml.etree.CommentBase):
+    """An lxml comment with the minidom Comment API."""
+
+    nodeType = Node.COMMENT_NODE
+    nodeName = "#comment"
+
+    @property
+    def data(self):
+        return self.text or ""
+
+    def toxml(self, encoding=None):
+        xml = f"<!--{self.data}-->"
+        return xml.encode(encoding) if encoding else xml
+
+
+class ProcessingInstruction(_TreeNode, lxml.etree.PIBase):
+    """An lxml processing instruction with the minidom API."""
+
+    nodeType = Node.PROCESSING_INSTRUCTION_NODE
+
+    @property
+    def data(self):
+        return self.text or ""
+
+    @property
+    def nodeName(self):
+        return self.target
+
+    def toxml(self, encoding=None):
+        xml = f"<?{self.target} {self.data}?>"
+        return xml.encode(encoding) if encoding else xml
+
+
+class Text(_NodeTypes):
+    """A text node: lxml's text of owner (is_tail False) or tail (is_tail True).
+
+    A Text created with owner None holds its data until it is inserted.
+    """
+
+    nodeType = Node.TEXT_NODE
+    nodeName = "#text"
+
+    def __init__(self, owner, is_tail, data=None):
+        self.owner = None
+        self.is_tail = is_tail
+        self._data = data
+        if owner is not None:
+            self._attach(owner, is_tail)
+
+    def _attach(self, owner, is_tail):
+        """Make this node the view of a slot (the slot keeps its content)."""
+        if self.owner is not None and _texts.get((self.owner, self.is_tail)) is self:
+            del _texts[(self.owner, self.is_tail)]
+        self.owner, self.is_tail, self._data = owner, is_tail, None
+        _texts.setdefault((owner, is_tail), self)
+
+    @property
+    def data(self):
+        if self.owner is None:
+            return self._data or ""
+        return (self.owner.tail if self.is_tail else self.owner.text) or ""
+
+    @data.setter
+    def data(self, value):
+        if self.owner is None:
+            self._data = value
+        elif self.is_tail:
+            self.owner.tail = value
+        else:
+            self.owner.text = value
+
+    nodeValue = data
+
+    @property
+    def parentNode(self):
+        if self.owner is None:
+            return None
+        return self.owner.getparent() if self.is_tail else self.owner
+
+    @property
+    def nextSibling(self):
+        if self.owner is None:
+            return None
+        if self.is_tail:
+            return self.owner.getnext()
+        return self.owner[0] if len(self.owner) else None
+
+    @property
+    def previousSibling(self):
+        return self.owner if self.owner is not None and self.is_tail else None
+
+    def _detach(self):
+        if self.owner is not None:
+            data = self.data
+            self.data = None
+            if _texts.get((self.owner, self.is_tail)) is self:
+                del _texts[(self.owner, self.is_tail)]
+            self.owner, self._data = None, data
+
+    def _move_to(self, parent, reference):
+        """Insert this text into parent before reference (None: at the end)."""
+        data = self.data
+        self._detach()
+        if isinstance(reference, Text):
+            owner, is_tail = reference.owner, reference.is_tail
+            prepend = True
+        else:
+            if reference is None:
+                previous = parent[-1] if len(parent) else None
+            else:
+                previous = reference.getprevious()
+            owner, is_tail = (previous, True) if previous is not None else (parent, False)
+            prepend = False
+        self._attach(owner, is_tail)
+        current = self.data
+        self.data = data + current if prepend else current + data
+
+    def cloneNode(self, deep=False):
+        return Text(None, False, self.data)
+
+    def toxml(self, encoding=None):
+        xml = _escape_text(self.data)
+        return xml.encode(encoding) if encoding else xml
+
+
+class _Attr(_NodeTypes):
+    """A minidom-style attribute (name and value)."""
+
+    nodeType = Node.ATTRIBUTE_NODE
+
+    def __init__(self, name, value):
+        self.name = self.nodeName = name
+        self.value = self.nodeValue = value
+
+
+class _Attributes:
+    """minidom NamedNodeMap view of an element's attributes.
+
+    Namespace declarations made on the element come first, as xmlns attributes.
+    """
+
+    def __init__(self, elem):
+        declarations = [
+            _Attr(f"xmlns:{prefix}" if prefix else "xmlns", uri)
+            for prefix, uri in _own_namespaces(elem).items()
+        ]
+        prefixes = {uri: prefix for prefix, uri in elem.nsmap.items() if prefix}
+        prefixes[XML_NAMESPACE] = "xml"
+        attributes = []
+        for key, value in elem.attrib.items():
+            uri, _, local = key[1:].rpartition("}") if key[0] == "{" else ("", "", key)
+            name = f"{prefixes[uri]}:{local}" if uri in prefixes else local
+            attributes.append(_Attr(name, value))
+        self._attrs = declarations + attributes
+
+    def __len__(self):
+        return len(self._attrs)
+
+    @property
+    def length(self):
+        return len(self._attrs)
+
+    def item(self, index):
+        return self._attrs[index] if 0 <= index < len(self._attrs) else None
+
+    def __getitem__(self, name):
+        for attr in self._attrs:
+            if attr.name == name:
+                return attr
+        raise KeyError(name)
+
+    def keys(self):
+        return [attr.name for attr in self._attrs]
+
+    def items(self):
+        return [(attr.name, attr.value) for attr in self._attrs]
+
+
+class Document(_NodeTypes):
+    """minidom-style Document wrapping an lxml ElementTree."""
+
+    nodeType = Node.DOCUMENT_NODE
+    nodeName = "#document"
+    parentNode = None
+
+    def __init__(self, tree):
+        _check_entities(tree)
+        self._tree = tree
+        self._standalone = tree.docinfo.standalone
+        _documents[tree.getroot()] = self
+
+    @property
+    def documentElement(self):
+        return self._tree.getroot()
+
+    @property
+    def childNodes(self):
+        root = self.documentElement
+        before = list(root.itersiblings(preceding=True))[::-1]
+        return before + [root] + list(root.itersiblings())
+
+    @property
+    def firstChild(self):
+        return self.childNodes[0]
+
+    def getElementsByTagName(self, name):
+        return list(self.documentElement._iter_tag(name))
+
+    def createElement(self, name):
+        nsmap = self.documentElement.nsmap
+        key = _resolve(name, nsmap)
+        if key is None:
+            raise ValueError(f"Undeclared namespace prefix in element: {name}")
+        # Declare the element's own namespace so its tagName keeps the prefix
+        # while detached; lxml drops the declaration again on insertion
+        prefix = name.rpartition(":")[0] or None
+        if prefix == "xml" or prefix not in nsmap:
+            return self.documentElement.makeelement(key)
+        return self.documentElement.makeelement(key, nsmap={prefix: nsmap[prefix]})
+
+    def createTextNode(self, data):
+        return Text(None, False, data)
+
+    def importNode(self, node, deep):
+        """Copy a node from another Document for insertion into this one."""
+        return node.cloneNode(deep)
+
+    def toxml(self, encoding=None):
+        """Serialize the document, keeping the standalone declaration."""
+        # lxml reports a missing standalone declaration like standalone="no"
+        standalone = ' standalone="yes"' if self._standalone else ""
+        if encoding:
+            declaration = f'<?xml version="1.0" encoding="{encoding}"{standalone}?>\n'
+            body = lxml.etree.tostring(
+                self._tree, encoding=encoding, xml_declaration=False
+            )
+            return declaration.encode(encoding) + body
+        declaration = f'<?xml version="1.0"{standalone}?>\n'
+        return declaration + lxml.etree.tostring(self._tree, encoding="unicode")
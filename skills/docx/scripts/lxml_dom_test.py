@@ -0,0 +1,143 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from xml.etree.ElementTree import canonicalize
+
+from .document import DocxXMLEditor
+from .utilities import ENGINES
+
+
+# Currently this is not run automatically in CI; run it from skills/docx with
+# python -m unittest scripts.lxml_dom_test
+SAMPLE = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+            xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+            mc:Ignorable="">
+  <w:body>
+    <w:p w:rsidR="00000001">
+      <w:r><w:t>alpha</w:t></w:r>
+      <w:r><w:t xml:space="preserve">beta </w:t></w:r>
+    </w:p>
+    <w:p>
+      <w:r><w:t>gamma</w:t></w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+W16DU = "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+
+
+class TestEnginesAgree(unittest.TestCase):
+    """Applies the same edits with each engine and compares the results."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def run_on_engines(self, edit):
+        """Run edit(editor) per engine; return {engine: (canonical XML, result)}."""
+        outcomes = {}
+        for engine in ENGINES:
+            xml_path = self.temp_dir / f"{engine}.xml"
+            xml_path.write_text(SAMPLE, encoding="utf-8")
+            editor = DocxXMLEditor(xml_path, rsid="00AB12CD", engine=engine)
+            result = edit(editor)
+            outcomes[engine] = (canonicalize(editor.dom.toxml()), result)
+        return outcomes
+
+    def assert_engines_agree(self, edit):
+        outcomes = self.run_on_engines(edit)
+        (first, expected), *others = outcomes.items()
+        for engine, outcome in others:
+            self.assertEqual(outcome, expected, f"{engine} differs from {first}")
+        return expected[1]
+
+    def test_structural_edits(self):
+        def edit(editor):
+            dom = editor.dom
+            first, second = dom.getElementsByTagName("w:p")
+            runs = first.getElementsByTagName("w:r")
+            # Move a run, with the whitespace around it, to the other paragraph
+            second.insertBefore(runs[1], second.firstChild)
+            first.removeChild(runs[0])
+            second.appendChild(runs[0].cloneNode(True))
+            replacement = dom.createElement("w:r")
+            replacement.appendChild(dom.createElement("w:tab"))
+            first.appendChild(replacement)
+            first.replaceChild(dom.createElement("w:bookmarkStart"), replacement)
+            # Adjacent text nodes merge with lxml, so only elements are compared
+            return [
+                [
+                    node.tagName
+                    for node in para.childNodes
+                    if node.nodeType == node.ELEMENT_NODE
+                ]
+                for para in dom.getElementsByTagName("w:p")
+            ]
+
+        self.assert_engines_agree(edit)
+
+    def test_attribute_and_text_edits(self):
+        def edit(editor):
+            para = editor.dom.getElementsByTagName("w:p")[0]
+            para.setAttribute("w:rsidRDefault", "00000002")
+            para.removeAttribute("w:rsidR")
+            text = para.getElementsByTagName("w:t")[0].firstChild
+            text.data = "a < b & c"
+            extra = editor.dom.createElement("w:t")
+            extra.appendChild(editor.dom.createTextNode("tail"))
+            para.getElementsByTagName("w:r")[1].appendChild(extra)
+            return (
+                para.hasAttribute("w:rsidR"),
+                para.getAttribute("w:rsidRDefault"),
+                sorted(para.attributes.keys()),
+                editor._get_element_text(para),
+            )
+
+        self.assertEqual(
+            self.assert_engines_agree(edit),
+            (False, "00000002", ["w:rsidRDefault"], "a < b & cbeta tail"),
+        )
+
+    def test_editor_methods(self):
+        def edit(editor):
+            para = editor.get_node(tag="w:p", contains="gamma")
+            run = editor.get_node(tag="w:r", contains="alpha")
+            editor.insert_before(run, "<w:r><w:t>before</w:t></w:r>")
+            editor.insert_after(run, "<w:r><w:t>after</w:t></w:r>")
+            editor.append_to(para, "<w:r><w:t>end</w:t></w:r>")
+            editor.replace_node(run, "<w:r><w:t>replaced</w:t></w:r>")
+            return [
+                editor._get_element_text(p)
+                for p in editor.dom.getElementsByTagName("w:p")
+            ]
+
+        self.assertEqual(
+            self.assert_engines_agree(edit),
+            ["beforereplacedafterbeta ", "gammaend"],
+        )
+
+    def test_namespace_declaration_keeps_the_root(self):
+        def edit(editor):
+            root = editor.dom.documentElement
+            body = root.getElementsByTagName("w:body")[0]
+            # A tracked change declares w16du on the root
+            run = editor.get_node(tag="w:r", contains="gamma")
+            editor.replace_node(run, "<w:ins><w:r><w:t>new</w:t></w:r></w:ins>")
+            # References taken before the declaration still work
+            root.appendChild(editor.dom.createElement("w:sectPr"))
+            body.appendChild(editor.dom.createElement("w:p"))
+            return (
+                root is editor.dom.documentElement,
+                root.getAttribute("xmlns:w16du"),
+                len(editor.dom.getElementsByTagName("w:sectPr")),
+                len(editor.dom.getElementsByTagName("w:p")),
+            )
+
+        self.assertEqual(self.assert_engines_agree(edit), (True, W16DU, 1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,15 +28,56 @@ Example usage:
 
     # Save changes
     editor.save()
+
+By default get_node checks every element with the requested tag, so it always
+sees the DOM as it is. Nothing is cached on this path: a contains search reads
+the text of every candidate on each call, because nodes that were handed out
+may have been edited directly. For many lookups on a large part, editor.build_index()
+adds per-editor indexes (by tag, by attribute value and by line number) that
+the editing methods keep current; while they are in use, call
+editor.reindex(node) after changing editor.dom directly. For many text searches
+over one tag, editor.build_text_index("w:p") makes
+get_node(tag="w:p", contains=...) independent of the document size.
+The editing methods keep the parsed markup of recent fragments, so inserting
+the same XML shape again with different text skips the XML parse.
+
+XMLEditor(path, engine="lxml") parses with lxml instead of minidom (see
+lxml_dom.py). The nodes have the same minidom-style API and the editor
+methods behave the same, with much lower memory use on large parts.
 """
 
+import bisect
 import html
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
 
+from . import lxml_dom
+
+# Parsers selectable with XMLEditor(engine=...)
+ENGINES = ("minidom", "lxml")
+
+# Parsed fragment shapes kept per editor (see XMLEditor._parse_fragments)
+FRAGMENT_CACHE_SIZE = 256
+
+# A start, end or empty-element tag; quoted attribute values may contain ">"
+_MARKUP = re.compile(r"""<(?:[^>"']|"[^"]*"|'[^']*')*>""")
+_XML_ENTITIES = {"lt": "<", "gt": ">", "amp": "&", "quot": '"', "apos": "'"}
+_XML_ENTITY = re.compile(r"&(lt|gt|amp|quot|apos);")
+# Text that is left to the parser: markup, CRs, character references,
+# other entities and characters XML does not allow
+_UNUSUAL_TEXT = re.compile(
+    r"[<\r]|]]>|&(?!(?:lt|gt|amp|quot|apos);)"
+    r"|[^\t\n\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+)
+
 
 class XMLEditor:
     """
@@ -49,29 +90,63 @@ class XMLEditor:
     Attributes:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        engine: Parser behind dom ('minidom' or 'lxml')
         dom: Parsed DOM tree with parse_position attributes on elements
+        dirty: True if dom is known to have changed since it was loaded or
+            saved, as set by the editing methods and reindex. Direct edits
+            are not tracked; save_if_changed looks for them (see there).
     """
 
-    def __init__(self, xml_path):
+    def __init__(self, xml_path, engine="minidom"):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
             xml_path: Path to XML file to edit (str or Path)
+            engine: "minidom" (default) or "lxml" for a faster, smaller tree
+                with the same node API
 
         Raises:
-            ValueError: If the XML file does not exist
+            ValueError: If the XML file does not exist or the engine is unknown
         """
         self.xml_path = Path(xml_path)
         if not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown XML engine: {engine}. Expected one of: {', '.join(ENGINES)}"
+            )
+        self.engine = engine
 
         with open(self.xml_path, "rb") as f:
             header = f.read(200).decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        if engine == "lxml":
+            self._dom = lxml_dom.parse(self.xml_path)
+        else:
+            parser = _create_line_tracking_parser()
+            self._dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+
+        self.dirty = False
+        # Whether the DOM or its nodes were handed out, after which they may
+        # be changed directly without the editor knowing
+        self._handed_out = False
+
+        # Lookup indexes for get_node, built by build_index
+        self._index = None
+        # (tags, attribute, prefix) -> _IdTracker, seeded on first use
+        self._id_trackers = {}
+        # Namespace declarations of the root for fragment wrappers, and the
+        # parsed fragment shapes (text replaced by placeholders), LRU first
+        self._namespace_prelude = None
+        self._fragment_templates = OrderedDict()
+
+    @property
+    def dom(self):
+        """The parsed DOM tree (see the class attributes)."""
+        self._handed_out = True
+        return self._dom
 
     def get_node(
         self,
@@ -86,6 +161,11 @@ class XMLEditor:
         Finds an element by either its line number in the original file or by
         matching attribute values. Exactly one match must be found.
 
+        Without build_index each call checks every <tag> element, and a contains
+        search reads the text of each of them from the DOM. The cached texts
+        only come with build_index and build_text_index; use them for many
+        lookups on a large part.
+
         Args:
             tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
             attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
@@ -109,40 +189,51 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
-
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
-
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        node = self._find_node(tag, attrs, line_number, contains)
+        self._handed_out = True
+        return node
+
+    def _find_node(self, tag, attrs=None, line_number=None, contains=None):
+        """get_node for internal lookups, which does not count as handing out."""
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        text = html.unescape(contains) if contains is not None else None
+
+        index = self._index
+        if index is None:
+            # Without an index every <tag> element is checked, so changes made
+            # to the DOM directly are always seen
+            matches = [
+                elem
+                for elem in self._dom.getElementsByTagName(tag)
+                if self._matches(
+                    elem, tag, attrs, line_number, text, self._get_element_text
+                )
+            ]
+        else:
+            # The cached text only narrows the candidates; the matches are
+            # confirmed against the live text, which may have been edited
+            candidates = index.candidates(tag, attrs, line_number, text)
+            matches = [
+                elem
+                for elem in candidates
+                if index.is_attached(elem)
+                and self._matches(
+                    elem, tag, attrs, line_number, text, self._get_element_text
+                )
+            ]
+
+        if not matches and index is not None:
+            # The DOM may have been changed directly; confirm with a full scan
+            matches = [
+                elem
+                for elem in self._dom.getElementsByTagName(tag)
+                if self._matches(
+                    elem, tag, attrs, line_number, text, self._get_element_text
+                )
+            ]
+            if matches:
+                self.reindex()
 
         if not matches:
             # Build descriptive error message
@@ -180,6 +271,130 @@ class XMLEditor:
             )
         return matches[0]
 
+    def _matches(self, elem, tag, attrs, line_number, text, get_text):
+        """Check an element against the get_node filters.
+
+        text is the already unescaped contains filter, and get_text returns the
+        text of an element (see _get_element_text). Candidates always come
+        from lookups by tag, so the tag itself is not checked again.
+        """
+        # Check line_number filter
+        if line_number is not None:
+            parse_pos = getattr(elem, "parse_position", (None,))
+            elem_line = parse_pos[0]
+
+            # Handle both single line number and range
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    return False
+            else:
+                if elem_line != line_number:
+                    return False
+
+        # Check attrs filter
+        if attrs is not None:
+            if not all(
+                elem.getAttribute(attr_name) == attr_value
+                for attr_name, attr_value in attrs.items()
+            ):
+                return False
+
+        # Check contains filter
+        if text is not None and text not in get_text(elem):
+            return False
+
+        return True
+
+    def reindex(self, node=None):
+        """
+        Update the lookup indexes after editing the DOM directly.
+
+        The editing methods (replace_node, insert_after, insert_before,
+        append_to) keep the indexes current on their own. Code that changes
+        editor.dom by hand should call this for the changed subtree, so that
+        get_node sees new elements and changed attribute values, the ID
+        allocators (get_next_id, get_next_rid) never hand out their IDs, and
+        the editor is marked dirty.
+        Call it without a node after declaring namespaces on the root by hand.
+
+        Args:
+            node: Root of the changed subtree, or None to rebuild all indexes
+
+        Example:
+            run.parentNode.insertBefore(new_run, run)
+            editor.reindex(new_run)
+        """
+        self.dirty = True
+        if node is None:
+            self._id_trackers.clear()
+            self._namespaces_changed()
+        else:
+            self._track_ids([node])
+        if self._index is None:
+            return
+        if node is None:
+            self._index = _NodeIndex(
+                self._dom, self._get_element_text, self._index.by_text
+            )
+        else:
+            self._index.add(node)
+
+    def build_index(self):
+        """
+        Index the elements by tag, attribute value and line number for get_node.
+
+        Without the index each get_node call checks every element with the
+        requested tag. With it, get_node only looks at the elements that can
+        match, which makes many lookups on a large part fast. The editing
+        methods keep the index current. Code that changes editor.dom directly
+        must call reindex for the changed subtree, or get_node may miss
+        elements added that way (and report one match where there are more).
+
+        Example:
+            editor.build_index()
+            for change_id in change_ids:
+                elem = editor.get_node(tag="w:ins", attrs={"w:id": change_id})
+        """
+        if self._index is None:
+            self._index = _NodeIndex(self._dom, self._get_element_text)
+
+    def build_text_index(self, tag):
+        """
+        Index the text of all <tag> elements for get_node(tag=tag, contains=...).
+
+        Without this index a contains search compares the text of every <tag>
+        element. With it, a search for 3 or more characters only looks at the
+        elements that contain every 3-character piece of the search string. The
+        index is kept current by the editing methods and costs memory in
+        proportion to the text size, so build it only for tags that are searched
+        many times. It comes with the index of build_index, and the same rules
+        for direct DOM changes apply.
+
+        Args:
+            tag: The XML tag name (e.g., "w:p")
+
+        Example:
+            editor.build_text_index("w:p")
+            for phrase in phrases:
+                para = editor.get_node(tag="w:p", contains=phrase)
+        """
+        self.build_index()
+        self._index.build_text_index(tag)
+
+    def _after_insert(self, nodes):
+        """Called with the nodes inserted by the editing methods."""
+        self.dirty = True
+        self._handed_out = True
+        # Account for explicit IDs first so prepared ones never collide
+        self._track_ids(nodes)
+        self._prepare_inserted(nodes)
+        if self._index is not None:
+            for node in nodes:
+                self._index.add(node)
+
+    def _prepare_inserted(self, nodes):
+        """Hook for subclasses to complete inserted nodes before they are indexed."""
+
     def _get_element_text(self, elem):
         """
         Recursively extract all text content from an element.
@@ -193,6 +408,10 @@ class XMLEditor:
         Returns:
             str: Concatenated text from all non-whitespace text nodes within the element
         """
+        if self.engine == "lxml":
+            # Same text nodes as the walk below, collected by lxml in C
+            return "".join(text for text in elem.itertext() if text.strip())
+
         text_parts = []
         for node in elem.childNodes:
             if node.nodeType == node.TEXT_NODE:
@@ -222,8 +441,70 @@ class XMLEditor:
         for node in nodes:
             parent.insertBefore(node, elem)
         parent.removeChild(elem)
+        if self._index is not None:
+            self._index.remove(elem, parent)
+        self._after_insert(nodes)
         return nodes
 
+    def replace_nodes(self, edits):
+        """
+        Replace several DOM elements with new XML content in one batch.
+
+        Does the same as calling replace_node for each edit, but parses all
+        fragments together and processes the inserted nodes in a single pass,
+        so thousands of edits take seconds. Edits are applied in document
+        order, whatever their order in the list, and share one timestamp.
+
+        Args:
+            edits: List of (element, xml_string) pairs. The elements must be
+                distinct, in the document, and not inside one another.
+
+        Returns:
+            List[List[defusedxml.minidom.Node]]: Inserted nodes of each edit,
+            in the order of edits
+
+        Raises:
+            ValueError: If an element is repeated, detached, or inside another
+                edited element
+
+        Example:
+            runs = [editor.get_node(tag="w:r", contains=word) for word in words]
+            editor.replace_nodes([
+                (run, f"<w:del><w:r><w:delText>{word}</w:delText></w:r></w:del>")
+                for run, word in zip(runs, words)
+            ])
+        """
+        if not edits:
+            return []
+        targets = [elem for elem, _ in edits]
+        positions = self._document_positions(targets)
+        if len(positions) != len(targets):
+            raise ValueError("Edited elements must be distinct and in the document")
+        for elem in targets:
+            parent = elem.parentNode
+            while parent is not None and parent.nodeType == parent.ELEMENT_NODE:
+                if parent in positions:
+                    raise ValueError(
+                        f"<{elem.tagName}> is inside another edited element "
+                        f"<{parent.tagName}>"
+                    )
+                parent = parent.parentNode
+
+        fragments = self._parse_fragments([content for _, content in edits])
+        inserted = []
+        for elem, nodes in sorted(
+            zip(targets, fragments), key=lambda edit: positions[edit[0]]
+        ):
+            parent = elem.parentNode
+            for node in nodes:
+                parent.insertBefore(node, elem)
+            parent.removeChild(elem)
+            if self._index is not None:
+                self._index.remove(elem, parent)
+            inserted.extend(nodes)
+        self._after_insert(inserted)
+        return fragments
+
     def insert_after(self, elem, xml_content):
         """
         Insert XML content after a DOM element.
@@ -246,6 +527,7 @@ class XMLEditor:
                 parent.insertBefore(node, next_sibling)
             else:
                 parent.appendChild(node)
+        self._after_insert(nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -266,6 +548,7 @@ class XMLEditor:
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
             parent.insertBefore(node, elem)
+        self._after_insert(nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -285,29 +568,168 @@ class XMLEditor:
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
             elem.appendChild(node)
+        self._after_insert(nodes)
         return nodes
 
+    def insert_nodes(self, edits):
+        """
+        Insert XML content at several places in one batch.
+
+        Does the same as calling insert_before, insert_after or append_to for
+        each edit in turn, but parses all fragments together and processes the
+        inserted nodes in a single pass. The inserted nodes share one timestamp.
+
+        Args:
+            edits: List of (where, element, xml_string) triples, where where is
+                "before", "after" or "append"
+
+        Returns:
+            List[List[defusedxml.minidom.Node]]: Inserted nodes of each edit,
+            in the order of edits
+
+        Raises:
+            ValueError: If where is not "before", "after" or "append"
+
+        Example:
+            editor.insert_nodes([
+                ("before", para, '<w:bookmarkStart w:id="0" w:name="a"/>'),
+                ("append", para, '<w:bookmarkEnd w:id="0"/>'),
+            ])
+        """
+        if not edits:
+            return []
+        for where, _, _ in edits:
+            if where not in ("before", "after", "append"):
+                raise ValueError(f"Unknown insertion point: {where!r}")
+
+        fragments = self._parse_fragments([content for _, _, content in edits])
+        inserted = []
+        for (where, elem, _), nodes in zip(edits, fragments):
+            if where == "append":
+                for node in nodes:
+                    elem.appendChild(node)
+            else:
+                parent = elem.parentNode
+                next_sibling = elem if where == "before" else elem.nextSibling
+                for node in nodes:
+                    if next_sibling:
+                        parent.insertBefore(node, next_sibling)
+                    else:
+                        parent.appendChild(node)
+            inserted.extend(nodes)
+        self._after_insert(inserted)
+        return fragments
+
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
-        max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
-            if rel_id.startswith("rId"):
-                try:
-                    max_id = max(max_id, int(rel_id[3:]))
-                except ValueError:
-                    pass
-        return f"rId{max_id + 1}"
+        return f"rId{self.get_next_id(('Relationship',), 'Id', prefix='rId', first=1)}"
+
+    def get_next_id(self, tags, attribute, prefix="", first=0):
+        """
+        Get the next unused numeric ID of an attribute on the given tags.
+
+        IDs are values of the form <prefix><integer>; other values are ignored.
+        The highest ID is found by one scan of the DOM on first use and then
+        kept current by the editing methods and reindex, so repeated calls are
+        cheap. The ID is not reserved: the next call returns the same ID until
+        an element using it has been inserted.
+
+        Args:
+            tags: Tag names whose attribute holds the IDs (e.g., ("w:ins", "w:del"))
+            attribute: Attribute name (e.g., "w:id")
+            prefix: Text before the number (e.g., "rId")
+            first: ID to return when no element has an ID yet
+
+        Returns:
+            int: One more than the highest ID in use, or first
+
+        Example:
+            comment_id = editor.get_next_id(("w:comment",), "w:id")
+        """
+        return self._id_tracker(tags, attribute, prefix, first).next_id
+
+    def _allocate_id(self, tags, attribute, prefix="", first=0):
+        """Like get_next_id, but reserve the ID for an attribute set directly."""
+        tracker = self._id_tracker(tags, attribute, prefix, first)
+        next_id = tracker.next_id
+        tracker.next_id += 1
+        return next_id
+
+    def _id_tracker(self, tags, attribute, prefix, first):
+        key = (tuple(tags), attribute, prefix)
+        tracker = self._id_trackers.get(key)
+        if tracker is None:
+            tracker = _IdTracker(key[0], attribute, prefix, first)
+            tracker.observe([self._dom.documentElement])
+            self._id_trackers[key] = tracker
+        return tracker
+
+    def _track_ids(self, nodes):
+        """Account for the IDs used in nodes added to the DOM."""
+        for tracker in self._id_trackers.values():
+            tracker.observe(nodes)
 
     def save(self):
         """
         Save the edited XML back to the file.
 
         Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        preserving the original encoding (ascii or utf-8). The file is replaced
+        rather than rewritten, so hard links to it keep the old content.
+
+        Returns:
+            int: Number of bytes written
+        """
+        return self._write(self._dom.toxml(encoding=self.encoding))
+
+    def save_if_changed(self):
+        """
+        Save the edited XML back to the file if it may have changed.
+
+        Dirty editors are saved. Editors that handed out their DOM or nodes
+        (through dom, get_node or the editing methods) since they were loaded
+        or last saved may have been changed directly, so their DOM is
+        serialized and the file is only replaced if the content differs.
+        Other editors are skipped without serializing anything. Nodes kept
+        from before a save are not watched any more: after editing one of them
+        directly, call reindex (or use dom or get_node again) before saving.
+
+        Returns:
+            int: Number of bytes written (0 if the file was left as it is)
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        if self.dirty:
+            return self.save()
+        if not self._handed_out:
+            return 0
+        content = self._dom.toxml(encoding=self.encoding)
+        if content == self.xml_path.read_bytes():
+            self._handed_out = False
+            return 0
+        return self._write(content)
+
+    def _write(self, content):
+        """Replace the file with content and mark the editor clean and unused."""
+        fd, temp_name = tempfile.mkstemp(dir=self.xml_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            shutil.copymode(self.xml_path, temp_name)
+            os.replace(temp_name, self.xml_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self.dirty = False
+        self._handed_out = False
+        return len(content)
+
+    def _document_positions(self, elems):
+        """Map each element of elems that is in the DOM to its document order."""
+        wanted = set(elems)
+        positions = {}
+        for position, elem in enumerate(self._dom.getElementsByTagName("*")):
+            if elem in wanted:
+                positions[elem] = position
+        return positions
 
     def _parse_fragment(self, xml_content):
         """
@@ -322,26 +744,381 @@ class XMLEditor:
         Raises:
             AssertionError: If fragment contains no element nodes
         """
-        # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
-        namespaces = []
-        if root_elem and root_elem.attributes:
-            for i in range(root_elem.attributes.length):
-                attr = root_elem.attributes.item(i)
-                if attr.name.startswith("xmlns"):  # type: ignore
-                    namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
-
-        ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
-        fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
-        ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
+        return self._parse_fragments([xml_content])[0]
+
+    def _parse_fragments(self, xml_contents):
+        """
+        Parse XML fragments and return their imported nodes.
+
+        The markup of each fragment is parsed once and kept as a template with
+        placeholder text; fragments that differ only in their text are cloned
+        from it and the text is filled in. Fragments not in the cache are
+        parsed together in one wrapper document.
+
+        Args:
+            xml_contents: List of strings containing XML fragments
+
+        Returns:
+            List with the list of imported nodes of each fragment
+
+        Raises:
+            AssertionError: If a fragment contains no element nodes
+        """
+        templates = self._fragment_templates
+        fragments = [None] * len(xml_contents)
+        misses = []
+        for i, xml_content in enumerate(xml_contents):
+            skeleton, texts = _split_text(xml_content)
+            template = templates.get(skeleton) if texts is not None else None
+            if template is None:
+                misses.append((i, skeleton, texts))
+            else:
+                templates.move_to_end(skeleton)
+                fragments[i] = self._instantiate(template, texts)
+
+        if misses:
+            try:
+                parsed = self._parse_wrapped([skeleton for _, skeleton, _ in misses])
+            except Exception:
+                # Report syntax errors against the fragments as written
+                self._parse_wrapped([xml_contents[i] for i, _, _ in misses])
+                raise
+            for (i, skeleton, texts), template in zip(misses, parsed):
+                elements = [n for n in template if n.nodeType == n.ELEMENT_NODE]
+                assert elements, "Fragment must contain at least one element"
+                if texts is not None:
+                    templates[skeleton] = template
+                    if len(templates) > FRAGMENT_CACHE_SIZE:
+                        templates.popitem(last=False)
+                fragments[i] = self._instantiate(template, texts)
+        return fragments
+
+    def _parse_wrapped(self, xml_contents):
+        """Parse fragments in one wrapper document and return their child nodes."""
+        if self._namespace_prelude is None:
+            # Extract namespace declarations from the root document element
+            root_elem = self._dom.documentElement
+            namespaces = []
+            if root_elem and root_elem.attributes:
+                for i in range(root_elem.attributes.length):
+                    attr = root_elem.attributes.item(i)
+                    if attr.name.startswith("xmlns"):  # type: ignore
+                        namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
+            self._namespace_prelude = " ".join(namespaces)
+
+        if len(xml_contents) == 1:
+            body = xml_contents[0]
+        else:
+            body = "".join(f"<fragment>{xml}</fragment>" for xml in xml_contents)
+        wrapper = f"<root {self._namespace_prelude}>{body}</root>"
+        if self.engine == "lxml":
+            fragment_doc = lxml_dom.parseString(wrapper)
+        else:
+            fragment_doc = defusedxml.minidom.parseString(wrapper)
+
+        containers = [fragment_doc.documentElement]
+        if len(xml_contents) > 1:
+            containers = containers[0].childNodes  # type: ignore
+            assert len(containers) == len(xml_contents), "Unbalanced fragment"
+        return [list(container.childNodes) for container in containers]  # type: ignore
+
+    def _instantiate(self, template, texts):
+        """Import the nodes of a parsed fragment, filling in its text if given."""
+        nodes = [self._dom.importNode(node, deep=True) for node in template]
+        if texts is not None:
+            for text_node, text in zip(_text_nodes(nodes), texts):
+                text_node.data = text
         return nodes
 
+    def _ensure_namespace(self, prefix, uri):
+        """Declare a namespace on the root element if it is not declared yet."""
+        root = self._dom.documentElement
+        if not root.hasAttribute(f"xmlns:{prefix}"):  # type: ignore
+            root.setAttribute(f"xmlns:{prefix}", uri)  # type: ignore
+            self.dirty = True
+            self._namespaces_changed()
+
+    def _namespaces_changed(self):
+        """Forget what was derived from the root's namespace declarations."""
+        self._namespace_prelude = None
+        self._fragment_templates.clear()
+
+
+def _split_text(xml_content):
+    """
+    Split a fragment into its markup with placeholder text, and its text.
+
+    Returns:
+        (skeleton, texts): texts holds the unescaped text of each placeholder
+        in document order, or is None (and skeleton is xml_content) if the
+        fragment has text that only a parser can decode
+    """
+    if "<!" in xml_content or "<?" in xml_content:
+        return xml_content, None
+    skeleton = []
+    texts = []
+    end = 0
+    for match in [*_MARKUP.finditer(xml_content), None]:
+        start = match.start() if match else len(xml_content)
+        if start > end:
+            text = xml_content[end:start]
+            if _UNUSUAL_TEXT.search(text):
+                return xml_content, None
+            skeleton.append("_")
+            texts.append(_XML_ENTITY.sub(lambda m: _XML_ENTITIES[m.group(1)], text))
+        if match:
+            skeleton.append(match.group())
+            end = match.end()
+    return "".join(skeleton), texts
+
+
+def _text_nodes(nodes):
+    """Return the text nodes in nodes and their descendants in document order."""
+    found = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node.nodeType == node.TEXT_NODE:
+            found.append(node)
+        elif node.nodeType == node.ELEMENT_NODE:
+            stack.extend(reversed(node.childNodes))
+    return found
+
+
+class _IdTracker:
+    """Next unused numeric ID of one attribute on some tags (see get_next_id)."""
+
+    def __init__(self, tags, attribute, prefix, first):
+        self.tags = tags
+        self.attribute = attribute
+        self.prefix = prefix
+        self.next_id = first
+
+    def observe(self, nodes):
+        """Raise next_id past the IDs used in nodes and their descendants."""
+        for node in nodes:
+            if node.nodeType != node.ELEMENT_NODE:
+                continue
+            for tag in self.tags:
+                if node.tagName == tag:
+                    self._use(node.getAttribute(self.attribute))
+                for elem in node.getElementsByTagName(tag):
+                    self._use(elem.getAttribute(self.attribute))
+
+    def _use(self, value):
+        if not value.startswith(self.prefix):
+            return
+        try:
+            number = int(value[len(self.prefix) :])
+        except ValueError:
+            return
+        if number >= self.next_id:
+            self.next_id = number + 1
+
+
+class _NodeIndex:
+    """
+    Lookup tables from tag, attribute value and line number to DOM elements.
+
+    The tag table is built in one pass over the DOM. Attribute tables are built
+    per (tag, attribute) on first use, and line tables per tag. Element text is
+    cached on first use, and text indexes exist only for the tags passed to
+    build_text_index. Entries can go stale when the DOM is changed without going
+    through XMLEditor, so callers check every candidate against the live DOM
+    before accepting it.
+    """
+
+    def __init__(self, dom, get_text, text_indexed_tags=()):
+        self.dom = dom
+        self.get_text = get_text
+        # tag -> elements, as an insertion-ordered set (dict with None values)
+        self.by_tag = {}
+        # (tag, attribute) -> attribute value -> elements
+        self.by_attr = {}
+        # tag -> attribute names with a table in by_attr
+        self.attrs_by_tag = {}
+        # tag -> (sorted line numbers, elements in the same order)
+        self.by_line = {}
+        # element -> text, as returned by XMLEditor._get_element_text
+        self.texts = {}
+        # tag -> _TextIndex
+        self.by_text = {}
+        for elem in dom.getElementsByTagName("*"):
+            self.by_tag.setdefault(elem.tagName, {})[elem] = None
+        for tag in text_indexed_tags:
+            self.build_text_index(tag)
+
+    def add(self, node):
+        """Index node and its descendants (indexing an element again is harmless).
+
+        The cached text of node, its descendants and its ancestors is dropped,
+        since inserting or changing node changes all of them.
+        """
+        if node.nodeType != node.ELEMENT_NODE:
+            self._text_changed(node.parentNode)
+            return
+        for elem in [node, *node.getElementsByTagName("*")]:
+            tag = elem.tagName
+            self.by_tag.setdefault(tag, {})[elem] = None
+            for attr in self.attrs_by_tag.get(tag, ()):
+                values = self.by_attr[(tag, attr)]
+                values.setdefault(elem.getAttribute(attr), {})[elem] = None
+            self._forget_text(elem)
+            # Line tables only hold parsed elements, which are never added
+            # again except after a move, and then they are already present
+        self._text_changed(node.parentNode)
+
+    def remove(self, node, parent):
+        """Drop node and its descendants, which were just removed from parent."""
+        if node.nodeType == node.ELEMENT_NODE:
+            for elem in [node, *node.getElementsByTagName("*")]:
+                tag = elem.tagName
+                self.by_tag.get(tag, {}).pop(elem, None)
+                for attr in self.attrs_by_tag.get(tag, ()):
+                    values = self.by_attr[(tag, attr)]
+                    values.get(elem.getAttribute(attr), {}).pop(elem, None)
+                self._forget_text(elem)
+        self._text_changed(parent)
+
+    def candidates(self, tag, attrs, line_number, text=None):
+        """Return the indexed elements that may match a get_node query."""
+        if line_number is not None:
+            return self._by_line_number(tag, line_number)
+        if attrs:
+            attr, value = next(iter(attrs.items()))
+            return list(self._attr_table(tag, attr).get(value, ()))
+        if text is not None and tag in self.by_text:
+            found = self.by_text[tag].candidates(text, self.by_tag.get(tag, {}))
+            if found is not None:
+                return found
+        return list(self.by_tag.get(tag, ()))
+
+    def is_attached(self, elem):
+        """Check whether elem is still part of the document."""
+        node = elem
+        while node is not None:
+            if node is self.dom:
+                return True
+            node = node.parentNode
+        return False
+
+    def text(self, elem):
+        """Return the text of elem, computing it with get_text on first use."""
+        text = self.texts.get(elem)
+        if text is None:
+            text = self.texts[elem] = self.get_text(elem)
+        return text
+
+    def build_text_index(self, tag):
+        """Create the text index for tag (see XMLEditor.build_text_index)."""
+        if tag not in self.by_text:
+            text_index = _TextIndex(self.text)
+            text_index.stale.update(self.by_tag.get(tag, ()))
+            self.by_text[tag] = text_index
+
+    def _forget_text(self, elem):
+        self.texts.pop(elem, None)
+        text_index = self.by_text.get(elem.tagName)
+        if text_index is not None:
+            text_index.stale.add(elem)
+
+    def _text_changed(self, node):
+        """Drop the cached text of node and its ancestors."""
+        while node is not None and node.nodeType == node.ELEMENT_NODE:
+            self._forget_text(node)
+            node = node.parentNode
+
+    def _attr_table(self, tag, attr):
+        key = (tag, attr)
+        if key not in self.by_attr:
+            values = {}
+            for elem in self.by_tag.get(tag, ()):
+                values.setdefault(elem.getAttribute(attr), {})[elem] = None
+            self.by_attr[key] = values
+            self.attrs_by_tag.setdefault(tag, []).append(attr)
+        return self.by_attr[key]
+
+    def _by_line_number(self, tag, line_number):
+        if tag not in self.by_line:
+            positioned = sorted(
+                (
+                    (elem.parse_position[0], i, elem)
+                    for i, elem in enumerate(self.by_tag.get(tag, ()))
+                    if hasattr(elem, "parse_position")
+                ),
+                key=lambda entry: entry[:2],
+            )
+            self.by_line[tag] = (
+                [line for line, _, _ in positioned],
+                [elem for _, _, elem in positioned],
+            )
+        lines, elems = self.by_line[tag]
+
+        if isinstance(line_number, range):
+            if line_number.step != 1:
+                return [e for line, e in zip(lines, elems) if line in line_number]
+            start, stop = line_number.start, line_number.stop
+        else:
+            start, stop = line_number, line_number + 1
+        return elems[bisect.bisect_left(lines, start) : bisect.bisect_left(lines, stop)]
+
+
+class _TextIndex:
+    """
+    Trigram index over the text of the elements of one tag.
+
+    Every element is listed under each 3-character substring of its text, so
+    the elements containing a search string are among those listed under all
+    of its trigrams. Elements whose text may have changed are kept in stale and
+    re-indexed before the next search.
+    """
+
+    def __init__(self, get_text):
+        self.get_text = get_text
+        self.postings = {}  # trigram -> elements
+        self.grams = {}  # element -> trigrams it is listed under
+        self.stale = set()
+
+    def candidates(self, text, live_elements):
+        """Return the elements that may contain text, or None if text is too short.
+
+        Args:
+            text: Search string
+            live_elements: Elements of the tag currently in the document
+        """
+        if len(text) < 3:
+            return None
+        self._refresh(live_elements)
+
+        lists = sorted(
+            (self.postings.get(gram, ()) for gram in _trigrams(text)), key=len
+        )
+        found = set(lists[0])
+        for elements in lists[1:]:
+            if not found:
+                break
+            found.intersection_update(elements)
+        return list(found)
+
+    def _refresh(self, live_elements):
+        for elem in self.stale:
+            for gram in self.grams.pop(elem, ()):
+                elements = self.postings[gram]
+                elements.discard(elem)
+                if not elements:
+                    del self.postings[gram]
+            if elem in live_elements:
+                grams = _trigrams(self.get_text(elem))
+                self.grams[elem] = grams
+                for gram in grams:
+                    self.postings.setdefault(gram, set()).add(elem)
+        self.stale.clear()
+
+
+def _trigrams(text):
+    """Return the set of 3-character substrings of text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
 
 def _create_line_tracking_parser():
     """
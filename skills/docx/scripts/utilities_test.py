@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from .utilities import ENGINES, XMLEditor
+
+
+# Currently this is not run automatically in CI; run it from skills/docx with
+# python -m unittest scripts.utilities_test
+SAMPLE = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:body>
+    <w:p>
+      <w:r><w:t>alpha</w:t></w:r>
+    </w:p>
+    <w:p>
+      <w:r><w:t>beta</w:t></w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+
+class XMLEditorTestCase(unittest.TestCase):
+    """Runs each test once per engine, on a fresh copy of SAMPLE."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def open_editor(self, engine, content=SAMPLE):
+        xml_path = self.temp_dir / f"{engine}.xml"
+        xml_path.write_text(content, encoding="utf-8")
+        return XMLEditor(xml_path, engine=engine)
+
+    def for_each_engine(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                yield engine, self.open_editor(engine)
+
+
+class TestGetNodeWithDirectEdits(XMLEditorTestCase):
+    def test_node_added_directly_makes_lookup_ambiguous(self):
+        for _, editor in self.for_each_engine():
+            para = editor.get_node(tag="w:p", contains="beta")
+            para.parentNode.appendChild(para.cloneNode(True))
+            with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+                editor.get_node(tag="w:p", contains="beta")
+
+    def test_node_removed_directly_is_not_found(self):
+        for _, editor in self.for_each_engine():
+            para = editor.get_node(tag="w:p", contains="beta")
+            para.parentNode.removeChild(para)
+            with self.assertRaisesRegex(ValueError, "Node not found"):
+                editor.get_node(tag="w:p", contains="beta")
+
+    def test_index_sees_nodes_added_through_reindex(self):
+        for _, editor in self.for_each_engine():
+            editor.build_index()
+            para = editor.get_node(tag="w:p", contains="beta")
+            copy = para.cloneNode(True)
+            para.parentNode.appendChild(copy)
+            editor.reindex(copy)
+            with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+                editor.get_node(tag="w:p", contains="beta")
+
+
+class TestGetNodeWithDirectTextEdits(XMLEditorTestCase):
+    def check_text_edit(self, editor):
+        text_node = editor.get_node(tag="w:t", contains="alpha").firstChild
+        text_node.data = "gamma"
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:t", contains="alpha")
+        found = editor.get_node(tag="w:t", contains="gamma")
+        self.assertEqual(found.firstChild.data, "gamma")
+
+    def test_without_index(self):
+        for _, editor in self.for_each_engine():
+            self.check_text_edit(editor)
+
+    def test_with_index(self):
+        for _, editor in self.for_each_engine():
+            editor.build_index()
+            self.check_text_edit(editor)
+
+    def test_with_text_index(self):
+        for _, editor in self.for_each_engine():
+            editor.build_text_index("w:t")
+            self.check_text_edit(editor)
+
+
+class TestSaveIfChanged(XMLEditorTestCase):
+    def test_direct_edit_is_saved(self):
+        for engine, editor in self.for_each_engine():
+            para = editor.get_node(tag="w:p", contains="beta")
+            para.parentNode.removeChild(para)
+            self.assertFalse(editor.dirty)
+            self.assertGreater(editor.save_if_changed(), 0)
+            reopened = XMLEditor(editor.xml_path, engine=engine)
+            with self.assertRaisesRegex(ValueError, "Node not found"):
+                reopened.get_node(tag="w:p", contains="beta")
+
+    def test_unchanged_editor_writes_nothing(self):
+        for _, editor in self.for_each_engine():
+            editor.get_node(tag="w:p", contains="beta")
+            editor.save_if_changed()  # May normalize the serialization
+            self.assertEqual(editor.save_if_changed(), 0)
+            editor.dom.documentElement.setAttribute("w:x", "1")
+            self.assertGreater(editor.save_if_changed(), 0)
+            self.assertEqual(editor.save_if_changed(), 0)
+
+    def test_saved_editor_is_not_serialized_again(self):
+        for _, editor in self.for_each_engine():
+            para = editor.get_node(tag="w:p", contains="beta")
+            editor.save_if_changed()
+            self.assertFalse(editor._handed_out)
+            # Internal lookups do not count as handing out nodes
+            editor._find_node(tag="w:p", contains="alpha")
+            self.assertFalse(editor._handed_out)
+            # A node kept from before the save is watched again after reindex
+            para.setAttribute("w:rsidR", "00000001")
+            editor.reindex(para)
+            self.assertGreater(editor.save_if_changed(), 0)
+            self.assertIn(b"00000001", editor.xml_path.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()